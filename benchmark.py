@@ -0,0 +1,295 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import resource
+import tempfile
+import multiprocessing
+
+# Named benchmark cases; every key is a generate_design() argument
+BENCHMARK_SUITE = {
+    "small": dict(width=50, height=50, obstacle_density=0.05, net_count=40, fanout=(2, 3), locality=0.3, seed=1),
+    "medium": dict(width=200, height=200, obstacle_density=0.08, net_count=300, fanout=(2, 4), locality=0.15, seed=2),
+    "dense": dict(width=100, height=100, obstacle_density=0.2, net_count=400, fanout=(2, 3), locality=0.1, seed=3),
+    "long": dict(width=300, height=300, obstacle_density=0.15, net_count=60, fanout=2, locality=1.0, seed=8),
+    "maze": dict(width=300, height=300, obstacle_density=0.35, net_count=30, fanout=(2, 3), locality=1.0, seed=9),
+    "fanout": dict(width=200, height=200, obstacle_density=0.05, net_count=60, fanout=(6, 12), locality=0.4, seed=4),
+    "multilayer": dict(width=200, height=200, obstacle_density=0.1, net_count=400, fanout=(2, 4), locality=0.15,
+                       layers=6, seed=6),
+    "large": dict(width=1000, height=1000, obstacle_density=0.05, net_count=2000, fanout=(2, 4), locality=0.03, seed=5),
+    "sparse": dict(width=5000, height=5000, obstacle_density=0.002, net_count=500, fanout=(2, 3), locality=0.005,
+                   seed=7),
+}
+
+BENCHMARK_ROUTERS = ("route_all_nets", "route_all_nets_parallel", "negotiated_route_all_nets", "route_all_nets_global")
+
+# Router modules in load order, for running this file outside the notebook
+ROUTER_MODULES = ("profiling.py", "routing_grid.py", "lee_search.py", "parse_updated.py", "route_update.py",
+                  "write_out.py", "parallel_route.py", "negotiated_route.py", "global_route.py", "binary_out.py",
+                  "eco_route.py")
+
+
+def generate_design(output_path, width, height, obstacle_density=0.05, net_count=100, fanout=(2, 4),
+                    locality=0.2, layers=2, seed=0):
+    """Write a random routing problem in the input file format.
+
+    Args:
+        output_path: Path to write the input file
+        width, height: Grid size, at most MAX_SIZE when that is set
+        obstacle_density: Fraction of cells that are obstacles
+        net_count: Number of nets
+        fanout: Pins per net, an int or an inclusive (min, max) range
+        locality: Side of the square each net's pins are drawn from, as a
+            fraction of the larger grid dimension; 1 spreads pins over the grid
+        layers: Pins are placed on layers 1..layers
+        seed: Random seed; the same arguments always give the same file
+
+    Returns:
+        The number of nets written, which is lower than net_count only if
+        the grid runs out of free cells
+    """
+    if MAX_SIZE is not None and (width > MAX_SIZE or height > MAX_SIZE):
+        raise ValueError(f"Grid size {width}x{height} exceeds limit of {MAX_SIZE}x{MAX_SIZE}")
+    rng = random.Random(seed)
+    min_fanout, max_fanout = (fanout, fanout) if isinstance(fanout, int) else fanout
+
+    obstacle_count = int(width * height * obstacle_density)
+    obstacles = {divmod(idx, height) for idx in rng.sample(range(width * height), obstacle_count)}
+
+    span = max(2, int(max(width, height) * locality))
+    taken = set()
+    nets = []
+    for _ in range(net_count):
+        pin_count = rng.randint(min_fanout, max_fanout)
+        center_x = rng.randrange(width)
+        center_y = rng.randrange(height)
+        x_range = (max(center_x - span // 2, 0), min(center_x + span // 2, width - 1))
+        y_range = (max(center_y - span // 2, 0), min(center_y + span // 2, height - 1))
+
+        pins = []
+        for _ in range(pin_count * 20):
+            if len(pins) == pin_count:
+                break
+            x = rng.randint(*x_range)
+            y = rng.randint(*y_range)
+            if (x, y) in obstacles or (x, y) in taken:
+                continue
+            taken.add((x, y))
+            pins.append((rng.randint(1, layers), x, y))
+        if len(pins) >= 2:
+            nets.append(pins)
+
+    with open(output_path, "w") as f:
+        f.write(f"{width}x{height}\n")
+        f.writelines(f"OBS ({x}, {y})\n" for x, y in sorted(obstacles))
+        for i, pins in enumerate(nets, start=1):
+            f.write(f"net{i} " + " ".join(f"({layer}, {x}, {y})" for layer, x, y in pins) + "\n")
+    return len(nets)
+
+
+def route_metrics(routed_nets):
+    """Wirelength (routed cells) and via count of a routing result, counting vias like visualize_routing."""
+    wirelength = 0
+    vias = 0
+    for path in routed_nets.values():
+        wirelength += len(path)
+        vias += (path if isinstance(path, Route) else Route.from_cells(path)).via_count()
+    return wirelength, vias
+
+
+def baseline_parse_input(file_path):
+    """The regex parser parse_input replaced, kept as the reference for parse_throughput.
+
+    It reads the whole file, matches every line with regular expressions
+    and marks obstacles in a nested [layer][y][x] list grid of two layers,
+    as the original did (without its 1000x1000 size limit).
+    """
+    with open(file_path, 'r') as f:
+        lines = f.readlines()
+
+    width, height = map(int, lines[0].strip().lower().split('x'))
+    grid = [[[0 for _ in range(width)] for _ in range(height)] for _ in range(2)]
+    obstacles = []
+    nets = {}
+    for line in lines[1:]:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('OBS'):
+            for x_str, y_str in re.findall(r'\((\d+),\s*(\d+)\)', line):
+                x, y = int(x_str), int(y_str)
+                obstacles.append((x, y))
+                grid[0][y][x] = -1
+                grid[1][y][x] = -1
+        elif line.startswith('net'):
+            pins = []
+            for layer_str, x_str, y_str in re.findall(r'\((\d+),\s*(\d+),\s*(\d+)\)', line):
+                x, y = int(x_str), int(y_str)
+                if 0 <= x < width and 0 <= y < height:
+                    pins.append(Cell(x, y, int(layer_str) - 1))
+            if pins:
+                nets[line.split()[0]] = pins
+    return width, height, obstacles, nets, nets, grid
+
+
+def parse_throughput(input_file, stack=None, repeat=3):
+    """Parse speed of parse_input and of baseline_parse_input on one file, best of repeat runs.
+
+    Returns:
+        Dictionary of the input size and both parsers' throughput in MB/s
+    """
+    size_mb = os.path.getsize(input_file) / 2 ** 20
+    result = {"input_mb": round(size_mb, 2)}
+    for key, parse in (("parse_mb_s", lambda: parse_input(input_file, stack or LAYER_STACK)),
+                       ("baseline_parse_mb_s", lambda: baseline_parse_input(input_file))):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parse()
+            best = min(best, time.perf_counter() - start)
+        result[key] = round(size_mb / best, 2)
+    return result
+
+
+def run_benchmark(input_file, router="route_all_nets", stack=None, **route_options):
+    """Parse and route one input file in this process and return its metrics as a dictionary.
+
+    stack defaults to LAYER_STACK. A "landmarks" route option is a landmark
+    count: Landmarks with that many landmarks are built after parsing and
+    their build time is recorded separately.
+    """
+    parse_start = time.perf_counter()
+    width, height, obstacles, nets, pins_by_net, grid = parse_input(input_file, stack or LAYER_STACK)
+    parse_time = time.perf_counter() - parse_start
+    parse_mb_s = os.path.getsize(input_file) / 2 ** 20 / parse_time
+
+    landmark_start = time.perf_counter()
+    if route_options.get("landmarks"):
+        route_options = dict(route_options, landmarks=Landmarks(
+            grid, route_options.get("via_cost", VIA_COST),
+            route_options.get("wrong_direction_cost", WRONG_DIRECTION_COST), route_options["landmarks"]))
+    landmark_time = time.perf_counter() - landmark_start
+
+    reset_search_stats()
+    route_start = time.perf_counter()
+    routed_nets = globals()[router](nets, pins_by_net, grid, width, height, **route_options)
+    route_time = time.perf_counter() - route_start
+
+    wirelength, vias = route_metrics(routed_nets)
+    routed = sum(1 for path in routed_nets.values() if path)
+    return {
+        "parse_time": round(parse_time, 4),
+        "parse_mb_s": round(parse_mb_s, 2),
+        "landmark_time": round(landmark_time, 4),
+        "route_time": round(route_time, 4),
+        "searches": SEARCH_STATS["searches"],
+        "nodes_expanded": SEARCH_STATS["nodes_expanded"],
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "grid_mb": round(grid.nbytes / 2 ** 20, 1),
+        "nets": len(nets),
+        "routed": routed,
+        "failed": len(nets) - routed,
+        "wirelength": wirelength,
+        "vias": vias,
+    }
+
+
+def _isolated_run(queue, input_file, router, stack, route_options):
+    try:
+        queue.put(run_benchmark(input_file, router, stack, **route_options))
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_suite(case_names, routers=("route_all_nets",), results_path="benchmark_results.jsonl",
+              repeat=1, route_options=None):
+    """Run every case with every router and append one JSON record per run to results_path.
+
+    Each run happens in a forked process, so peak memory is measured per run
+    and no router state leaks between runs.
+    """
+    route_options = route_options or {}
+    context = multiprocessing.get_context("fork")
+    records = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for case_name in case_names:
+            case = BENCHMARK_SUITE[case_name]
+            input_file = os.path.join(work_dir, f"{case_name}.txt")
+            generate_design(input_file, **case)
+            stack = LayerStack.alternating(case.get("layers", 2))
+
+            for router in routers:
+                for run in range(repeat):
+                    queue = context.Queue()
+                    process = context.Process(target=_isolated_run,
+                                              args=(queue, input_file, router, stack, route_options))
+                    process.start()
+                    result = queue.get()
+                    process.join()
+
+                    record = {"case": case_name, **case, "router": router, "run": run,
+                              "route_options": route_options, **result}
+                    records.append(record)
+                    with open(results_path, "a") as f:
+                        f.write(json.dumps(record) + "\n")
+                    print(f"{case_name:>8} {router:<28} " + (
+                        result["error"] if "error" in result else
+                        f"{result['route_time']:8.2f}s {result['searches']:8d} searches "
+                        f"{result['nodes_expanded']:10d} nodes {result['peak_rss_mb']:8.1f} MB "
+                        f"{result['routed']}/{result['nets']} routed"))
+    return records
+
+
+def run_parse_suite(case_names, results_path="benchmark_results.jsonl", repeat=3):
+    """Measure parse_throughput on every case and append one JSON record per case to results_path."""
+    records = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for case_name in case_names:
+            case = BENCHMARK_SUITE[case_name]
+            input_file = os.path.join(work_dir, f"{case_name}.txt")
+            generate_design(input_file, **case)
+            result = parse_throughput(input_file, LayerStack.alternating(case.get("layers", 2)), repeat)
+
+            record = {"case": case_name, **case, "benchmark": "parse", **result}
+            records.append(record)
+            with open(results_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+            print(f"{case_name:>8} parse {result['input_mb']:7.2f} MB {result['parse_mb_s']:8.2f} MB/s "
+                  f"(baseline {result['baseline_parse_mb_s']:.2f} MB/s)")
+    return records
+
+
+def benchmark_main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the maze router benchmark suite.")
+    parser.add_argument("--cases", nargs="+", default=["small", "medium", "dense", "fanout"],
+                        choices=sorted(BENCHMARK_SUITE))
+    parser.add_argument("--routers", nargs="+", default=["route_all_nets"], choices=BENCHMARK_ROUTERS)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--options", default="{}", help="JSON object of extra route_net options")
+    parser.add_argument("--output", default="benchmark_results.jsonl")
+    parser.add_argument("--parse", action="store_true",
+                        help="Only measure parse throughput against the baseline parser")
+    args = parser.parse_args(argv)
+
+    configure_logging(logging.WARNING)
+
+    if args.parse:
+        run_parse_suite(args.cases, args.output, max(args.repeat, 3))
+        return 0
+    run_suite(args.cases, args.routers, args.output, args.repeat, json.loads(args.options))
+    return 0
+
+
+if __name__ == "__main__":
+    # Outside the notebook, load the router modules into this namespace first
+    router_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in ROUTER_MODULES:
+        module_path = os.path.join(router_dir, module)
+        with open(module_path) as f:
+            exec(compile(f.read(), module_path, "exec"), globals())
+    sys.exit(benchmark_main())
@@ -0,0 +1,129 @@
+import struct
+import itertools
+import numpy as np
+
+# Binary routing result layout (little endian):
+#   header      magic, version, bytes per coordinate, net count, name bytes, cell count
+#   net table   one record per net: name offset/length and cell offset/count
+#   names       UTF-8 net names, concatenated, padded to 8 bytes
+#   cells       (layer, x, y) rows of int16 or int32, layer 0-based
+BINARY_MAGIC = b"MZRT"
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<4sHHIQQ")
+_NET_TABLE_DTYPE = np.dtype([
+    ("name_offset", "<u8"),
+    ("name_length", "<u4"),
+    ("cell_count", "<u4"),
+    ("cell_offset", "<u8"),
+])
+
+
+def _padded(size, alignment=8):
+    return (size + alignment - 1) // alignment * alignment
+
+
+def write_binary_output(routed_nets, output_path):
+    """Write routing results in the binary format, without per-cell string formatting.
+
+    Args:
+        routed_nets: Dictionary of net names to routed paths
+        output_path: Path to write the binary file
+    """
+    nets = [(net_name, path) for net_name, path in routed_nets.items() if path]
+    counts = np.array([len(path) for _, path in nets], dtype=np.uint64)
+    total_cells = int(counts.sum())
+
+    # Routes expand their segments directly; cell lists are (x, y, layer) tuples that flatten into an int array
+    coords = np.concatenate([path.coords() if isinstance(path, Route) else
+                             np.fromiter(itertools.chain.from_iterable(path), dtype=np.int64,
+                                         count=3 * len(path)).reshape(-1, 3)
+                             for _, path in nets] or [np.zeros((0, 3), dtype=np.int64)])
+    coord_bytes = 2 if coords.size == 0 or coords.max() < 2 ** 15 else 4
+    cells = coords[:, [2, 0, 1]].astype(f"<i{coord_bytes}")
+
+    names = [net_name.encode("utf-8") for net_name, _ in nets]
+    table = np.zeros(len(nets), dtype=_NET_TABLE_DTYPE)
+    table["name_length"] = [len(name) for name in names]
+    table["name_offset"][1:] = np.cumsum(table["name_length"], dtype=np.uint64)[:-1]
+    table["cell_count"] = counts
+    table["cell_offset"][1:] = np.cumsum(counts)[:-1]
+    names_blob = b"".join(names)
+
+    with open(output_path, "wb") as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, coord_bytes, len(nets), len(names_blob), total_cells))
+        f.write(table.tobytes())
+        f.write(names_blob.ljust(_padded(len(names_blob)), b"\0"))
+        f.write(cells.tobytes())
+
+    logger.info("Routing complete. Binary output saved to %s", output_path)
+
+
+def read_binary_output(input_path):
+    """Memory-map a binary routing result.
+
+    Returns:
+        Dictionary of net names to read-only (N, 3) arrays of (layer, x, y)
+        rows with 0-based layers, all views into one memory map of the file
+    """
+    raw = np.memmap(input_path, dtype=np.uint8, mode="r")
+    if raw.size < _HEADER.size:
+        raise ValueError(f"{input_path}: too short for a binary routing result")
+    magic, version, coord_bytes, net_count, names_size, total_cells = _HEADER.unpack(raw[:_HEADER.size].tobytes())
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"{input_path}: not a binary routing result")
+    if version != BINARY_VERSION:
+        raise ValueError(f"{input_path}: unsupported binary routing format version {version}")
+
+    table_start = _HEADER.size
+    names_start = table_start + net_count * _NET_TABLE_DTYPE.itemsize
+    cells_start = names_start + _padded(names_size)
+    cells_end = cells_start + total_cells * 3 * coord_bytes
+    if raw.size < cells_end:
+        raise ValueError(f"{input_path}: truncated binary routing result")
+
+    table = raw[table_start:names_start].view(_NET_TABLE_DTYPE)
+    names_blob = raw[names_start:names_start + names_size].tobytes()
+    cells = raw[cells_start:cells_end].view(f"<i{coord_bytes}").reshape(-1, 3)
+
+    routes = {}
+    for name_offset, name_length, cell_count, cell_offset in table.tolist():
+        net_name = names_blob[name_offset:name_offset + name_length].decode("utf-8")
+        routes[net_name] = cells[cell_offset:cell_offset + cell_count]
+    return routes
+
+
+def is_binary_output(path):
+    with open(path, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def read_text_output(output_path):
+    """Parse a text routing result back into a dictionary of net names to Routes."""
+    routed_nets = {}
+    with open(output_path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            net_name = line.split(None, 1)[0]
+            routed_nets[net_name] = Route.from_cells(
+                Cell(x, y, layer - 1) for layer, x, y in scan_tuples(line, len(net_name), 3, output_path, line_number))
+    return routed_nets
+
+
+def read_routing_result(path):
+    """Read a text or binary routing result as a dictionary of net names to Routes."""
+    if not is_binary_output(path):
+        return read_text_output(path)
+    return {net_name: Route.from_cells((x, y, layer) for layer, x, y in cells.tolist())
+            for net_name, cells in read_binary_output(path).items()}
+
+
+def text_to_binary(text_path, binary_path):
+    """Convert a text routing result to the binary format."""
+    write_binary_output(read_text_output(text_path), binary_path)
+
+
+def binary_to_text(binary_path, text_path):
+    """Convert a binary routing result back to the text format."""
+    write_output(read_routing_result(binary_path), text_path)
@@ -0,0 +1,140 @@
+import numpy as np
+
+
+def _route_neighbours(cell, cells):
+    """The cells of a route one planar step or one via away from cell."""
+    x, y, layer = cell
+    return [neighbour for neighbour in ((x + 1, y, layer), (x - 1, y, layer), (x, y + 1, layer), (x, y - 1, layer),
+                                        (x, y, layer + 1), (x, y, layer - 1)) if neighbour in cells]
+
+
+def trim_route(path, pins):
+    """Drop the dead ends of a route that no longer lead to a pin, e.g. after a pin was removed.
+
+    Returns:
+        (route, connected): the route with every branch ending away from
+        a pin cut back, as a Route (path itself when nothing was cut), and
+        whether the remaining cells form one connected tree holding every pin
+    """
+    cells = set(path)
+    pin_set = set(pins)
+    if not pin_set <= cells:
+        return path, False
+
+    degree = {cell: len(_route_neighbours(cell, cells)) for cell in cells}
+    dead_ends = [cell for cell, count in degree.items() if count <= 1 and cell not in pin_set]
+    trimmed = len(cells)
+    while dead_ends:
+        cell = dead_ends.pop()
+        cells.discard(cell)
+        for neighbour in _route_neighbours(cell, cells):
+            degree[neighbour] -= 1
+            if degree[neighbour] <= 1 and neighbour not in pin_set:
+                dead_ends.append(neighbour)
+    if len(cells) < trimmed:
+        path = Route.from_cells(cell for cell in path if cell in cells)
+
+    # Every remaining cell must be reachable from the first pin
+    start = next(iter(pin_set))
+    reached = {start}
+    stack = [start]
+    while stack:
+        for neighbour in _route_neighbours(stack.pop(), cells):
+            if neighbour not in reached:
+                reached.add(neighbour)
+                stack.append(neighbour)
+    return path, len(reached) == len(cells)
+
+
+def previous_route_problem(net_name, path, pins, grid, new_pins):
+    """Why a previous route of a net cannot be committed on the grid as it is now, or None if it can.
+
+    The route must stay on the grid, avoid obstacles, other nets' new pins
+    and cells already committed for other nets (except at its own pins,
+    which route_net may enter in any case), and reach every pin.
+
+    Args:
+        new_pins: Dictionary of the pins that are not on their own net's
+            previous route (pins added since, and the pins of new nets) to
+            their net names
+    """
+    coords = path.coords() if isinstance(path, Route) else np.array(path, dtype=np.int64).reshape(-1, 3)
+    xs, ys, layers = coords.T
+    if ((xs < 0) | (xs >= grid.width) | (ys < 0) | (ys >= grid.height) | (layers < 0) | (layers >= grid.layers)).any():
+        return "leaves the grid"
+    indices = layers * grid.plane + ys * grid.width + xs
+    if (grid.cells.reshape(-1)[indices] == RoutingGrid.OBSTACLE).any():
+        return "runs over an obstacle"
+    owners = grid.flat_owner[indices]
+    clashes = (owners >= 0) & ~np.isin(indices, grid.path_indices(pins))
+    if clashes.any():
+        return f"collides with {grid.net_names[int(owners[clashes][0])]}"
+    for cell in path:
+        if new_pins.get(cell, net_name) != net_name:
+            return f"crosses a new pin of {new_pins[cell]}"
+    if not set(pins) <= set(path):
+        return "does not reach every pin"
+    return None
+
+
+def route_all_nets_incremental(nets, pins_by_net, grid, width, height, previous_routes, via_cost=VIA_COST,
+                               wrong_direction_cost=WRONG_DIRECTION_COST, **route_options):
+    """Route a changed design starting from the routes of an earlier run (an ECO pass).
+
+    The previous routes (net names to routes, e.g. from read_routing_result)
+    are compared with the current design in the order route_all_nets uses.
+    A route whose net is gone is dropped. A route that runs over a new
+    obstacle, into an earlier kept route or over a pin another net gained,
+    or that misses one of its net's pins, is discarded (see
+    previous_route_problem). Otherwise the dead ends left by removed pins
+    are trimmed (see trim_route) and it is committed without searching.
+    Only new nets and discarded routes are routed, with route_net around
+    the kept routes; nets that still fail go through rip_up_and_reroute,
+    which may rip up kept routes too.
+
+    Extra keyword arguments are passed on to every route_net call.
+    """
+    sorted_nets = order_nets_by_length(nets)
+    new_pins = {}
+    for net_name, pins in nets.items():
+        previous_cells = set(previous_routes.get(net_name) or ())
+        new_pins.update((pin, net_name) for pin in pins if pin not in previous_cells)
+
+    routed_nets = {}
+    tracker = CongestionTracker(grid)
+    to_route = []
+    for net_name, pins in sorted_nets:
+        path = previous_routes.get(net_name)
+        if not path:
+            problem = "has no previous route"
+        else:
+            problem = previous_route_problem(net_name, path, pins, grid, new_pins)
+        if problem is None:
+            path, connected = trim_route(path, pins)
+            if not connected:
+                problem = "is not connected"
+        if problem is None:
+            commit_net_route(net_name, path, routed_nets, grid, tracker)
+        else:
+            logger.debug("Re-routing %s: previous route %s", net_name, problem)
+            to_route.append(net_name)
+    logger.info("Incremental routing: kept %d previous routes, dropped %d of removed nets, routing %d nets",
+                len(routed_nets), len(set(previous_routes) - set(nets)), len(to_route))
+
+    failed_nets = []
+    for net_name in to_route:
+        logger.debug("Routing %s...", net_name)
+        path = route_net(net_name, nets, pins_by_net, grid, width, height,
+                         via_cost, wrong_direction_cost, routed_nets, tracker, **route_options)
+        if path:
+            commit_net_route(net_name, path, routed_nets, grid, tracker)
+            logger.debug("Successfully routed %s with %d cells", net_name, len(path))
+        else:
+            logger.info("Failed to route %s", net_name)
+            failed_nets.append(net_name)
+
+    if failed_nets:
+        logger.info("\nRip-up and re-route phase - %d failed nets", len(failed_nets))
+        return rip_up_and_reroute(failed_nets, nets, pins_by_net, grid, width, height,
+                                  routed_nets, via_cost, wrong_direction_cost, tracker, **route_options)
+    return routed_nets
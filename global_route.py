@@ -0,0 +1,196 @@
+import heapq
+import itertools
+from typing import NamedTuple
+import numpy as np
+
+# Configuration constants
+GLOBAL_TILE_SIZE = 16  # Side, in cells, of a global routing tile
+GLOBAL_CORRIDOR_MARGIN = 1  # Tiles added around a net's global route to form its detailed routing corridor
+GLOBAL_OVERFLOW_COST = 8  # Extra global cost per unit of demand above an edge's capacity
+
+
+class Corridor(NamedTuple):
+    """Set of (tile_x, tile_y) tiles of tile_size x tile_size cells that a search may expand into."""
+    tile_size: int
+    tiles: frozenset
+
+    def bounds(self, width, height):
+        """Inclusive (min_x, min_y, max_x, max_y) cell box around the corridor, clipped to the grid."""
+        xs = [tile_x for tile_x, _ in self.tiles]
+        ys = [tile_y for _, tile_y in self.tiles]
+        return (min(xs) * self.tile_size, min(ys) * self.tile_size,
+                min((max(xs) + 1) * self.tile_size, width) - 1, min((max(ys) + 1) * self.tile_size, height) - 1)
+
+
+class GlobalGrid:
+    """Coarse routing graph of tile_size x tile_size tiles.
+
+    Neighbouring tiles are joined by an edge whose capacity is the number
+    of (layer, track) pairs that cross their shared boundary between two
+    free cells. ``h_capacity``/``h_usage`` have shape (tiles_y, tiles_x - 1)
+    and hold the edges between horizontally adjacent tiles;
+    ``v_capacity``/``v_usage``, shape (tiles_y - 1, tiles_x), the vertical ones.
+    """
+
+    def __init__(self, grid, tile_size=GLOBAL_TILE_SIZE):
+        self.tile_size = tile_size
+        self.tiles_x = -(-grid.width // tile_size)
+        self.tiles_y = -(-grid.height // tile_size)
+
+        # Pad to whole tiles; padding counts as blocked
+        free = np.zeros((grid.layers, self.tiles_y * tile_size, self.tiles_x * tile_size), dtype=bool)
+        free[:, :grid.height, :grid.width] = ~grid.obstacle_mask()
+
+        crossing = free[:, :, tile_size - 1:-1:tile_size] & free[:, :, tile_size::tile_size]
+        self.h_capacity = crossing.sum(axis=0).reshape(self.tiles_y, tile_size, self.tiles_x - 1).sum(axis=1)
+        crossing = free[:, tile_size - 1:-1:tile_size, :] & free[:, tile_size::tile_size, :]
+        self.v_capacity = crossing.sum(axis=0).reshape(self.tiles_y - 1, self.tiles_x, tile_size).sum(axis=2)
+
+        self.h_usage = np.zeros_like(self.h_capacity)
+        self.v_usage = np.zeros_like(self.v_capacity)
+
+    def tile_of(self, cell):
+        return cell.x // self.tile_size, cell.y // self.tile_size
+
+    def _edge(self, a, b):
+        """(usage array, capacity array, index) of the edge between adjacent tiles a and b."""
+        (ax, ay), (bx, by) = a, b
+        if ay == by:
+            return self.h_usage, self.h_capacity, (ay, min(ax, bx))
+        return self.v_usage, self.v_capacity, (min(ay, by), ax)
+
+    def edge_cost(self, a, b):
+        usage, capacity, index = self._edge(a, b)
+        cap = int(capacity[index])
+        if cap == 0:
+            return None
+        used = int(usage[index])
+        return 1 + used / cap + GLOBAL_OVERFLOW_COST * max(0, used + 1 - cap)
+
+    def route(self, pins):
+        """Connect a net's pin tiles with cheapest tile paths, growing a tree from its first pin.
+
+        Returns:
+            List of (tile, tile) edges used, or None if some pin tile is unreachable
+        """
+        pin_tiles = {self.tile_of(pin) for pin in pins}
+        tree = {self.tile_of(pins[0])}
+        targets = pin_tiles - tree
+        edges = []
+
+        while targets:
+            counter = itertools.count()
+            queue = [(0, next(counter), tile) for tile in tree]
+            cost = {tile: 0 for tile in tree}
+            parent = {}
+            reached = None
+            while queue:
+                g, _, tile = heapq.heappop(queue)
+                if tile in targets:
+                    reached = tile
+                    break
+                if g > cost[tile]:
+                    continue
+                x, y = tile
+                for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    nx, ny = neighbour
+                    if not (0 <= nx < self.tiles_x and 0 <= ny < self.tiles_y):
+                        continue
+                    step = self.edge_cost(tile, neighbour)
+                    if step is None:
+                        continue
+                    if g + step < cost.get(neighbour, float('inf')):
+                        cost[neighbour] = g + step
+                        parent[neighbour] = tile
+                        heapq.heappush(queue, (g + step, next(counter), neighbour))
+            if reached is None:
+                return None
+
+            tile = reached
+            while tile not in tree:
+                edges.append((parent[tile], tile))
+                tree.add(tile)
+                tile = parent[tile]
+            targets.discard(reached)
+            targets -= tree
+
+        return edges
+
+    def commit(self, edges, amount=1):
+        for a, b in edges:
+            usage, _, index = self._edge(a, b)
+            usage[index] += amount
+
+    def overflow(self):
+        """Total demand above capacity over all edges, and the number of overflowed edges."""
+        h_over = np.maximum(self.h_usage - self.h_capacity, 0)
+        v_over = np.maximum(self.v_usage - self.v_capacity, 0)
+        return int(h_over.sum() + v_over.sum()), int(np.count_nonzero(h_over) + np.count_nonzero(v_over))
+
+    def utilization(self):
+        """Per-tile (tiles_y, tiles_x) map of the highest usage/capacity ratio among the tile's edges."""
+        def ratio(usage, capacity):
+            return np.divide(usage, capacity, out=np.where(usage > 0, np.inf, 0.0), where=capacity > 0)
+
+        util = np.zeros((self.tiles_y, self.tiles_x))
+        h = ratio(self.h_usage, self.h_capacity)
+        v = ratio(self.v_usage, self.v_capacity)
+        util[:, :-1] = np.maximum(util[:, :-1], h)
+        util[:, 1:] = np.maximum(util[:, 1:], h)
+        util[:-1, :] = np.maximum(util[:-1, :], v)
+        util[1:, :] = np.maximum(util[1:, :], v)
+        return util
+
+    def corridor(self, pins, edges, margin=GLOBAL_CORRIDOR_MARGIN):
+        """Tiles of a net's global route and pins, grown by margin tiles, as a Corridor."""
+        tiles = {self.tile_of(pin) for pin in pins}
+        for a, b in edges:
+            tiles.add(a)
+            tiles.add(b)
+        grown = set()
+        for x, y in tiles:
+            for gx in range(max(x - margin, 0), min(x + margin, self.tiles_x - 1) + 1):
+                for gy in range(max(y - margin, 0), min(y + margin, self.tiles_y - 1) + 1):
+                    grown.add((gx, gy))
+        return Corridor(self.tile_size, frozenset(grown))
+
+
+def global_route(nets, grid, tile_size=GLOBAL_TILE_SIZE, margin=GLOBAL_CORRIDOR_MARGIN):
+    """Route every net on the coarse tile grid in routing order and derive its corridor.
+
+    Returns:
+        (corridors, global_grid): dictionary of net names to Corridors for
+        route_net's corridors option, and the GlobalGrid with the edge usage
+        of all global routes, for inspecting congestion before detailed routing
+    """
+    global_grid = GlobalGrid(grid, tile_size)
+    corridors = {}
+    for net_name, pins in order_nets_by_length(nets):
+        if len(pins) < 2:
+            continue
+        edges = global_grid.route(pins)
+        if edges is None:
+            logger.debug("No global route for %s; it will be routed without a corridor", net_name)
+            continue
+        global_grid.commit(edges)
+        corridors[net_name] = global_grid.corridor(pins, edges, margin)
+
+    overflow, overflowed_edges = global_grid.overflow()
+    logger.info("Global routing: %d/%d nets on %dx%d tiles, %d overflowed edges (total overflow %d), "
+                "peak utilization %.2f", len(corridors), len(nets), global_grid.tiles_x, global_grid.tiles_y,
+                overflowed_edges, overflow, float(global_grid.utilization().max(initial=0)))
+    return corridors, global_grid
+
+
+def route_all_nets_global(nets, pins_by_net, grid, width, height, via_cost=VIA_COST,
+                          wrong_direction_cost=WRONG_DIRECTION_COST, tile_size=GLOBAL_TILE_SIZE,
+                          margin=GLOBAL_CORRIDOR_MARGIN, **route_options):
+    """Two-stage routing: global routing on coarse tiles, then detailed routing inside each net's corridor.
+
+    Detailed routing is route_all_nets with every search confined to the
+    net's corridor; a step that fails inside the corridor falls back to the
+    ordinary search windows.
+    """
+    corridors, _ = global_route(nets, grid, tile_size, margin)
+    return route_all_nets(nets, pins_by_net, grid, width, height, via_cost, wrong_direction_cost,
+                          corridors=corridors, **route_options)
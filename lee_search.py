@@ -1,116 +1,595 @@
 from collections import deque
+import heapq
 import time
 import itertools
+import numpy as np
 import matplotlib.patches as mpatches
 
-class Cell:
-    def __init__(self, x, y, layer):
-        self.x = x
-        self.y = y
-        self.layer = layer
-    
-    def __repr__(self):
-        return f"({self.layer}, {self.x}, {self.y})"
-    
-    def __eq__(self, other):
-        if not isinstance(other, Cell):
-            return False
-        return self.x == other.x and self.y == other.y and self.layer == other.layer
-    
-    def __hash__(self):
-        return hash((self.x, self.y, self.layer))
-    
-    def __lt__(self, other):
-        # For sorting in priority queue
-        if not isinstance(other, Cell):
-            return NotImplemented
-        # Sort by layer first, then x, then y
-        return (self.layer, self.x, self.y) < (other.layer, other.x, other.y)
-    
-    def __gt__(self, other):
-        if not isinstance(other, Cell):
-            return NotImplemented
-        return (self.layer, self.x, self.y) > (other.layer, other.x, other.y)
-    
-    def __le__(self, other):
-        if not isinstance(other, Cell):
-            return NotImplemented
-        return (self.layer, self.x, self.y) <= (other.layer, other.x, other.y)
-    
-    def __ge__(self, other):
-        if not isinstance(other, Cell):
-            return NotImplemented
-        return (self.layer, self.x, self.y) >= (other.layer, other.x, other.y)
+# Running totals over every wavefront search; reset with reset_search_stats()
+SEARCH_STATS = {"searches": 0, "nodes_expanded": 0}
 
-def lee_search(grid, start, end, width, height, via_cost, wrong_direction_cost, congestion_map=None, used_cells=None):
-    """Lee's algorithm with overlap avoidance and congestion-aware routing."""
 
-    if start == end:
-        return [start]
+def reset_search_stats():
+    for key in SEARCH_STATS:
+        SEARCH_STATS[key] = 0
+
+
+def _record_search(expanded, frontier_peak, search_start):
+    SEARCH_STATS["searches"] += 1
+    SEARCH_STATS["nodes_expanded"] += expanded
+    if search_start is not None:
+        PROFILER.record_search(expanded, frontier_peak, time.perf_counter() - search_start)
+
+
+def _window_state(grid, width, height, window, corridor, congestion_map, used_cells):
+    """Window-local buffers for one search.
+
+    Returns:
+        (window, local_width, local_height, cells, congestion, used): the
+        window with None resolved to the whole grid, its size, and flat
+        views of the cell states (cells outside the corridor marked as
+        obstacles), congestion penalties and other nets' occupancy, each
+        indexed by ``layer * plane + local_y * local_width + local_x``;
+        congestion and used are None when not given
+    """
+    if window is None:
+        window = (0, 0, width - 1, height - 1)
+    min_x, min_y, max_x, max_y = window
+    local_width = max_x - min_x + 1
+    local_height = max_y - min_y + 1
+    plane = local_width * local_height
+
+    cells = _window_view(grid.cells, window)
+    if corridor is not None:
+        outside = np.ones((local_height, local_width), dtype=bool)
+        size_t = corridor.tile_size
+        for tile_x, tile_y in corridor.tiles:
+            x0 = max(tile_x * size_t, min_x) - min_x
+            y0 = max(tile_y * size_t, min_y) - min_y
+            x1 = min((tile_x + 1) * size_t - 1, max_x) - min_x
+            y1 = min((tile_y + 1) * size_t - 1, max_y) - min_y
+            if x0 <= x1 and y0 <= y1:
+                outside[y0:y1 + 1, x0:x1 + 1] = False
+        block = np.array(cells, dtype=np.int8).reshape(grid.layers, local_height, local_width)
+        block[:, outside] = RoutingGrid.OBSTACLE
+        cells = memoryview(block.reshape(-1))
+    congestion = _window_view(congestion_map, window) if congestion_map is not None else None
+
+    # Occupancy of other nets as a flat lookup, taken straight from a tracker when given
+    if isinstance(used_cells, CongestionTracker):
+        used = _window_view(used_cells.usage, window)
+    elif used_cells:
+        used = bytearray(grid.layers * plane)
+        for x, y, layer in used_cells:
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                used[layer * plane + (y - min_y) * local_width + (x - min_x)] = 1
+    else:
+        used = None
+    return window, local_width, local_height, cells, congestion, used
+
+
+def _search_heuristic(grid, window, targets, via_cost, wrong_direction_cost, landmarks=None, sources=()):
+    """Consistent lower bound on the cost from a window-local (x, y, layer) to the nearest target.
+
+    The planar distance to the targets' bounding box is priced at the
+    cheapest step along each axis on any layer, plus the vias to the nearest
+    target layer (a round trip to a neighbouring layer when already on one).
+    On a target layer the path may instead stay put and pay that layer's
+    own direction costs. Landmarks raise the bound to their triangle
+    inequality bound unless a source is an obstacle cell, which the
+    landmark tables never expand.
+    """
+    min_x, min_y, _, _ = window
+    min_tx = min(t.x for t in targets) - min_x
+    max_tx = max(t.x for t in targets) - min_x
+    min_ty = min(t.y for t in targets) - min_y
+    max_ty = max(t.y for t in targets) - min_y
+
+    stack = grid.stack
+    layers = len(stack)
+    step_costs = [(1, wrong_direction_cost) if direction == LayerStack.HORIZONTAL else (wrong_direction_cost, 1)
+                  for direction in stack.directions]
+    x_step = min(x_cost for x_cost, _ in step_costs)
+    y_step = min(y_cost for _, y_cost in step_costs)
+
+    # Stacked via cost between two layers is a difference of running sums
+    via_height = [0]
+    for layer in range(layers - 1):
+        via_height.append(via_height[-1] + stack.via_cost(layer, via_cost))
+    target_layers = {t.layer for t in targets}
+    layer_bounds = []
+    for layer in range(layers):
+        via_bound = float('inf')
+        for target_layer in target_layers:
+            if target_layer != layer:
+                via_bound = min(via_bound, abs(via_height[layer] - via_height[target_layer]))
+            else:
+                for neighbour in (layer - 1, layer + 1):
+                    if 0 <= neighbour < layers:
+                        via_bound = min(via_bound, 2 * abs(via_height[layer] - via_height[neighbour]))
+        own_x, own_y = step_costs[layer] if layer in target_layers else (None, None)
+        layer_bounds.append((via_bound, own_x, own_y))
+
+    # Called for every push, so written with conditionals rather than max()/min()
+    def heuristic(x, y, layer):
+        dx = min_tx - x if x < min_tx else (x - max_tx if x > max_tx else 0)
+        dy = min_ty - y if y < min_ty else (y - max_ty if y > max_ty else 0)
+        via_bound, own_x, own_y = layer_bounds[layer]
+        h = dx * x_step + dy * y_step + via_bound
+        if own_x is not None:
+            own = dx * own_x + dy * own_y
+            if own < h:
+                return own
+        return h
+
+    if landmarks is None:
+        return heuristic
+    if (landmarks.via_cost, landmarks.wrong_direction_cost) != (via_cost, wrong_direction_cost):
+        raise ValueError(f"Landmarks built for via_cost={landmarks.via_cost}, "
+                         f"wrong_direction_cost={landmarks.wrong_direction_cost} cannot bound a search with "
+                         f"via_cost={via_cost}, wrong_direction_cost={wrong_direction_cost}")
+    if any(landmarks.blocked[grid.cell_index(source)] for source in sources):
+        return heuristic
+    landmark_bounds = landmarks.bounds_for(targets)
+    plane, width = grid.plane, grid.width
+
+    def landmark_heuristic(x, y, layer):
+        h = heuristic(x, y, layer)
+        idx = layer * plane + (y + min_y) * width + x + min_x
+        for costs, lowest, highest in landmark_bounds:
+            cost = costs[idx]
+            if cost >= 0:
+                h = max(h, lowest - cost, cost - highest)
+        return h
+
+    return landmark_heuristic
 
-    moves = [
-        (1, 0, 0, 1),    # Right
-        (-1, 0, 0, 1),   # Left
-        (0, 1, 0, wrong_direction_cost),   # Down
-        (0, -1, 0, wrong_direction_cost),  # Up
-    ]
 
-    via_moves = []
-    if start.layer == 0:
-        via_moves.append((0, 0, 1, via_cost))
-    elif start.layer == 1:
-        via_moves.append((0, 0, -1, via_cost))
+def _wavefront_search(grid, sources, targets, width, height, via_cost, wrong_direction_cost,
+                      congestion_map=None, used_cells=None, window=None, corridor=None, landmarks=None):
+    """A* wavefront from every source cell to the first target cell reached.
 
-    def heuristic(cell):
-        return abs(cell.x - end.x) + abs(cell.y - end.y)
+    Search state covers only the window: the cell states, occupancy and
+    congestion inside it are copied (or, for tiled grids, paged in) into
+    flat buffers indexed by ``layer * plane + local_y * local_width +
+    local_x``, so memory follows the window rather than the grid. g-scores,
+    parents and visited stamps are lanes of the grid's SearchWorkspace,
+    reused from search to search, and its masked cells are closed. The
+    frontier is a binary heap. The heuristic (see _search_heuristic) prices
+    the distance to the targets' bounding box by layer direction and via
+    costs; it is consistent, so the first target popped is reached optimally.
+    Target cells are always enterable; the path is rebuilt from parent
+    pointers once one of them is popped.
 
-    queue = [(heuristic(start), 0, start, [])]
-    visited = set()
+    Moves and their costs come from the grid's layer stack: one table per
+    layer with the planar moves priced by its preferred direction and vias
+    to the layers directly above and below.
+
+    Args:
+        window: Optional (min_x, min_y, max_x, max_y) box, inclusive, that
+            expansion is restricted to; None searches the whole grid
+        corridor: Optional Corridor; cells outside its tiles are treated as
+            blocked (targets stay enterable)
+        landmarks: Optional Landmarks that tighten the heuristic
+    """
+    profiling = PROFILER.enabled
+    search_start = time.perf_counter() if profiling else None
+
+    window, local_width, local_height, cells, congestion, used = _window_state(
+        grid, width, height, window, corridor, congestion_map, used_cells)
+    min_x, min_y, max_x, max_y = window
+    plane = local_width * local_height
+    size = grid.layers * plane
+
+    def local_index(cell):
+        x, y, layer = cell
+        return layer * plane + (y - min_y) * local_width + (x - min_x)
+
+    def in_window(cell):
+        return min_x <= cell.x <= max_x and min_y <= cell.y <= max_y
+
+    # (dx, dy, index offset, cost) per layer
+    layer_moves = grid.stack.moves(local_width, local_height, via_cost, wrong_direction_cost)
+
+    sources = [s for s in sources if in_window(s)]
+    targets = [t for t in targets if in_window(t)]
+    if not sources or not targets:
+        _record_search(0, 0, search_start)
+        return []
+
+    # Heuristic in local coordinates
+    target_set = {local_index(t) for t in targets}
+    heuristic = _search_heuristic(grid, window, targets, via_cost, wrong_direction_cost, landmarks, sources)
+
+    opened, closed, ((g_score, parent, stamp),) = grid.workspace.begin(size)
+    for idx in grid.workspace.masked_local(window, local_width, plane):
+        if idx not in target_set:
+            stamp[idx] = closed
+
+    counter = itertools.count()  # FIFO tie-break between equal f-scores
+    queue = []
+    for source in sources:
+        idx = local_index(source)
+        if stamp[idx] != opened:
+            stamp[idx] = opened
+            g_score[idx] = 0
+            parent[idx] = -1
+            queue.append((heuristic(source.x - min_x, source.y - min_y, source.layer), next(counter), idx))
+    heapq.heapify(queue)
+    expanded = 0
+    frontier_peak = 0
 
     while queue:
-        queue.sort(key=lambda x: x[0])
-        _, g_score, current, path = queue.pop(0)
+        if profiling and len(queue) > frontier_peak:
+            frontier_peak = len(queue)
+        _, _, idx = heapq.heappop(queue)
 
-        if current == end:
-            return path + [current]
+        if idx in target_set:
+            break
 
-        cell_key = (current.x, current.y, current.layer)
-        if cell_key in visited:
+        if stamp[idx] == closed:
             continue
-        visited.add(cell_key)
+        stamp[idx] = closed
+        expanded += 1
+
+        g = g_score[idx]
+        layer, rem = divmod(idx, plane)
+        y, x = divmod(rem, local_width)
 
-        for dx, dy, dlayer, base_cost in moves + via_moves:
-            new_layer = current.layer + dlayer
-            if not (0 <= new_layer <= 1):
+        for dx, dy, step, base_cost in layer_moves[layer]:
+            new_x = x + dx
+            new_y = y + dy
+            if not (0 <= new_x < local_width and 0 <= new_y < local_height):
                 continue
 
-            new_x = current.x + dx
-            new_y = current.y + dy
-            if not (0 <= new_x < width and 0 <= new_y < height):
+            new_idx = idx + step
+            state = stamp[new_idx]
+            if state == closed:
                 continue
 
-            if grid[new_layer][new_y][new_x] < 0:
+            is_target = new_idx in target_set
+            if cells[new_idx] < 0 and not is_target:
                 continue
 
-            new_cell = Cell(new_x, new_y, new_layer)
-            new_cell_key = (new_x, new_y, new_layer)
+            # Skip used cells (unless it's a target)
+            if used is not None and used[new_idx] and not is_target:
+                continue
+
+            cost = base_cost
+            if congestion is not None:
+                cost += congestion[new_idx] * 2  # Heavier penalty for congested cells
+
+            new_g = g + cost
+            if state != opened or new_g < g_score[new_idx]:
+                stamp[new_idx] = opened
+                g_score[new_idx] = new_g
+                parent[new_idx] = idx
+                heapq.heappush(queue, (new_g + heuristic(new_x, new_y, new_idx // plane), next(counter), new_idx))
+    else:
+        _record_search(expanded, frontier_peak, search_start)
+        return []  # No path found
+
+    _record_search(expanded, frontier_peak, search_start)
+
+    path = []
+    while idx != -1:
+        layer, rem = divmod(idx, plane)
+        y, x = divmod(rem, local_width)
+        path.append(Cell(x + min_x, y + min_y, layer))
+        idx = parent[idx]
+    path.reverse()
+    return path
+
+
+def lee_search(grid, start, end, width, height, via_cost, wrong_direction_cost, congestion_map=None, used_cells=None, window=None, corridor=None, landmarks=None):
+    """Lee's algorithm with overlap avoidance and congestion-aware routing."""
+
+    if start == end:
+        return [start]
+
+    return _wavefront_search(grid, [start], [end], width, height, via_cost, wrong_direction_cost,
+                             congestion_map, used_cells, window, corridor, landmarks)
+
+
+def bidirectional_search(grid, start, end, width, height, via_cost, wrong_direction_cost, congestion_map=None, used_cells=None, window=None, corridor=None, landmarks=None):
+    """Bidirectional A* between two cells, a drop-in replacement for lee_search.
 
-            # Skip used cells (unless it's the end)
-            if used_cells and new_cell_key in used_cells and new_cell != end:
+    One frontier grows forward from start and one backward from end over
+    reversed moves, which cost the same as the forward move (planar costs
+    depend only on the layer, via costs only on the layer pair) plus the
+    congestion penalty of the cell the forward move enters. Both frontiers
+    are ordered by the average potential p(v) = (h_end(v) - h_start(v)) / 2
+    of the two _search_heuristic bounds, forward keys g_f + p and backward keys
+    g_b - p, so the reduced costs are non-negative in both directions. The
+    frontier with the smaller top key is expanded next, and the search stops
+    once the two top keys add up to at least the cheapest start-end path
+    seen through a cell reached from both sides, which is then optimal.
+
+    Blocking, used_cells, congestion_map, window, corridor and landmarks
+    behave as in lee_search.
+
+    Returns:
+        Path from start to end, or [] if none is reachable
+    """
+    if start == end:
+        return [start]
+
+    profiling = PROFILER.enabled
+    search_start = time.perf_counter() if profiling else None
+
+    window, local_width, local_height, cells, congestion, used = _window_state(
+        grid, width, height, window, corridor, congestion_map, used_cells)
+    min_x, min_y, max_x, max_y = window
+    if not (min_x <= start.x <= max_x and min_y <= start.y <= max_y
+            and min_x <= end.x <= max_x and min_y <= end.y <= max_y):
+        _record_search(0, 0, search_start)
+        return []
+    plane = local_width * local_height
+    size = grid.layers * plane
+    layer_moves = grid.stack.moves(local_width, local_height, via_cost, wrong_direction_cost)
+
+    start_x, start_y = start.x - min_x, start.y - min_y
+    end_x, end_y = end.x - min_x, end.y - min_y
+    start_idx = start.layer * plane + start_y * local_width + start_x
+    end_idx = end.layer * plane + end_y * local_width + end_x
+
+    to_end = _search_heuristic(grid, window, [end], via_cost, wrong_direction_cost, landmarks, (start, end))
+    to_start = _search_heuristic(grid, window, [start], via_cost, wrong_direction_cost, landmarks, (start, end))
+
+    def potential(x, y, layer):
+        return (to_end(x, y, layer) - to_start(x, y, layer)) / 2
+
+    # Per direction: g-scores, parents, stamps, heap, sign of the potential and the cell it must not expand
+    opened, closed, (forward_lane, backward_lane) = grid.workspace.begin(size, lanes=2)
+    forward = (*forward_lane, [], 1, end_idx, start_idx)
+    backward = (*backward_lane, [], -1, start_idx, end_idx)
+    masked = grid.workspace.masked_local(window, local_width, plane)
+    counter = itertools.count()
+    for g_score, parent, stamp, queue, sign, _, origin in (forward, backward):
+        for idx in masked:
+            stamp[idx] = closed
+        stamp[start_idx] = stamp[end_idx] = 0
+        stamp[origin] = opened
+        g_score[origin] = 0
+        parent[origin] = -1
+        origin_cell = start if origin == start_idx else end
+        queue.append((sign * potential(origin_cell.x - min_x, origin_cell.y - min_y, origin_cell.layer),
+                      next(counter), origin))
+
+    best = float('inf')  # Cheapest start-end cost through a meeting cell found so far
+    meeting = -1
+    expanded = 0
+    frontier_peak = 0
+
+    forward_queue, backward_queue = forward[3], backward[3]
+    while forward_queue and backward_queue:
+        if profiling and len(forward_queue) + len(backward_queue) > frontier_peak:
+            frontier_peak = len(forward_queue) + len(backward_queue)
+        if forward_queue[0][0] + backward_queue[0][0] >= best:
+            break
+
+        side, other = (forward, backward) if forward_queue[0][0] <= backward_queue[0][0] else (backward, forward)
+        g_score, parent, stamp, queue, sign, stop_idx, _ = side
+        other_g, other_stamp = other[0], other[2]
+        _, _, idx = heapq.heappop(queue)
+        if stamp[idx] == closed:
+            continue
+        stamp[idx] = closed
+        if idx == stop_idx:
+            continue  # The far endpoint only ends paths
+        expanded += 1
+
+        g = g_score[idx]
+        layer, rem = divmod(idx, plane)
+        y, x = divmod(rem, local_width)
+        # Backward moves enter idx when read forward, so they pay its congestion
+        idx_penalty = congestion[idx] * 2 if congestion is not None and sign < 0 else 0
+
+        for dx, dy, step, base_cost in layer_moves[layer]:
+            new_x = x + dx
+            new_y = y + dy
+            if not (0 <= new_x < local_width and 0 <= new_y < local_height):
                 continue
 
-            if new_cell_key in visited:
+            new_idx = idx + step
+            state = stamp[new_idx]
+            if state == closed:
+                continue
+
+            # The far endpoint is always enterable
+            is_endpoint = new_idx == stop_idx
+            if cells[new_idx] < 0 and not is_endpoint:
+                continue
+            if used is not None and used[new_idx] and not is_endpoint:
                 continue
 
             cost = base_cost
-            if congestion_map:
-                cost += congestion_map[new_layer][new_y][new_x] * 2  # Heavier penalty for congested cells
+            if congestion is not None:
+                cost += congestion[new_idx] * 2 if sign > 0 else idx_penalty
+
+            new_g = g + cost
+            if state != opened or new_g < g_score[new_idx]:
+                stamp[new_idx] = opened
+                g_score[new_idx] = new_g
+                parent[new_idx] = idx
+                heapq.heappush(queue, (new_g + sign * potential(new_x, new_y, new_idx // plane), next(counter), new_idx))
+                if other_stamp[new_idx] >= opened and new_g + other_g[new_idx] < best:
+                    best = new_g + other_g[new_idx]
+                    meeting = new_idx
+
+    _record_search(expanded, frontier_peak, search_start)
+    if meeting == -1:
+        return []
+
+    def cell_at(idx):
+        layer, rem = divmod(idx, plane)
+        y, x = divmod(rem, local_width)
+        return Cell(x + min_x, y + min_y, layer)
+
+    path = []
+    idx = meeting
+    while idx != -1:
+        path.append(cell_at(idx))
+        idx = forward[1][idx]
+    path.reverse()
+    idx = backward[1][meeting]
+    while idx != -1:
+        path.append(cell_at(idx))
+        idx = backward[1][idx]
+    return path
+
+
+def multi_source_search(grid, sources, targets, width, height, via_cost, wrong_direction_cost, congestion_map=None, used_cells=None, window=None, corridor=None, landmarks=None):
+    """Single wavefront seeded from all sources that stops at the first target reached.
 
-            new_g = g_score + cost
-            new_f = new_g + heuristic(new_cell)
-            queue.append((new_f, new_g, new_cell, path + [current]))
+    Used to grow a multi-pin net: the sources are every cell of the net's
+    routed tree so far and the targets its unconnected pins.
 
-    return []  # No path found
+    Returns:
+        Path from one of the sources to the reached target, or [] if none is reachable
+    """
+    if not sources or not targets:
+        return []
+
+    return _wavefront_search(grid, sources, targets, width, height, via_cost, wrong_direction_cost,
+                             congestion_map, used_cells, window, corridor, landmarks)
+
+
+def _array_wavefront_search(grid, sources, targets, width, height, via_cost, wrong_direction_cost,
+                            congestion_map=None, used_cells=None, window=None, corridor=None):
+    """Lee wavefront run as whole-array NumPy operations, from every source to the cheapest target.
+
+    Distance labels, the cells still open and the move each cell was
+    reached by are flat arrays over the window; the frontier is an array of
+    flat indices. Each wave settles every pending cell within the cheapest
+    move cost of the nearest one (with unit costs, exactly one Lee wave),
+    then dilates the frontier through the six flat index offsets (four
+    planar moves and two vias) in a handful of array operations, whatever
+    its size. The path is traced back through the recorded moves once a
+    target is settled. The grid workspace's masked cells are closed like
+    blocked ones. Moves are priced like _wavefront_search, so paths
+    cost the same as lee_search's, though ties may be broken differently.
+    There is no heuristic: the waves grow evenly around the sources.
+    """
+    profiling = PROFILER.enabled
+    search_start = time.perf_counter() if profiling else None
+
+    window, local_width, local_height, cells, congestion, used = _window_state(
+        grid, width, height, window, corridor, congestion_map, used_cells)
+    min_x, min_y, max_x, max_y = window
+    plane = local_width * local_height
+    size = grid.layers * plane
+
+    sources = [s for s in sources if min_x <= s.x <= max_x and min_y <= s.y <= max_y]
+    targets = [t for t in targets if min_x <= t.x <= max_x and min_y <= t.y <= max_y]
+    if not sources or not targets:
+        _record_search(0, 0, search_start)
+        return []
+
+    def local_indices(cells_):
+        return np.array([c.layer * plane + (c.y - min_y) * local_width + (c.x - min_x) for c in cells_],
+                        dtype=np.int64)
+
+    # Move codes: +x, -x, +y, -y, via up, via down; move_cost[layer, code] is inf where there is no such move
+    offsets = np.array([1, -1, local_width, -local_width, plane, -plane], dtype=np.int64)
+    codes = {(1, 0, 1): 0, (-1, 0, -1): 1, (0, 1, local_width): 2, (0, -1, -local_width): 3,
+             (0, 0, plane): 4, (0, 0, -plane): 5}
+    move_cost = np.full((grid.layers, 6), np.inf)
+    for layer, moves in enumerate(grid.stack.moves(local_width, local_height, via_cost, wrong_direction_cost)):
+        for dx, dy, step, cost in moves:
+            move_cost[layer, codes[(dx, dy, step)]] = cost
+    step_floor = move_cost.min()
+    if step_floor <= 0:
+        raise ValueError("The array wavefront needs positive move costs")
+
+    open_cells = np.asarray(cells) >= 0
+    if used is not None:
+        open_cells &= np.asarray(used) == 0
+    open_cells[grid.workspace.masked_local(window, local_width, plane)] = False
+    target_indices = local_indices(targets)
+    open_cells[target_indices] = True
+    is_target = np.zeros(size, dtype=bool)
+    is_target[target_indices] = True
+    penalty = 2 * np.asarray(congestion, dtype=np.float64) if congestion is not None else None
+
+    dist = np.full(size, np.inf)
+    arrived_by = np.full(size, -1, dtype=np.int8)
+    pending = np.unique(local_indices(sources))
+    dist[pending] = 0
+    expanded = 0
+    frontier_peak = 0
+
+    while pending.size:
+        pending_dist = dist[pending]
+        settle = pending_dist < pending_dist.min() + step_floor
+        frontier = pending[settle]
+        pending = pending[~settle]
+        open_cells[frontier] = False
+        expanded += frontier.size
+        frontier_peak = max(frontier_peak, frontier.size)
+
+        reached = frontier[is_target[frontier]]
+        if reached.size:
+            idx = int(reached[np.argmin(dist[reached])])
+            break
+
+        # Dilate the frontier by every move at once: (frontier, move) arrays
+        layer, rem = np.divmod(frontier, plane)
+        y, x = np.divmod(rem, local_width)
+        inside = np.stack([x < local_width - 1, x > 0, y < local_height - 1, y > 0,
+                           layer < grid.layers - 1, layer > 0], axis=1)
+        neighbours = np.where(inside, frontier[:, None] + offsets, frontier[:, None])
+        candidates = dist[frontier][:, None] + move_cost[layer]
+        if penalty is not None:
+            candidates += penalty[neighbours]
+        keep = inside & open_cells[neighbours] & (candidates < dist[neighbours])
+        if not keep.any():
+            continue
+        neighbours, candidates = neighbours[keep], candidates[keep]
+        moved_by = np.nonzero(keep)[1].astype(np.int8)
+
+        # Cheapest candidate per neighbour
+        order = np.lexsort((candidates, neighbours))
+        neighbours, candidates, moved_by = neighbours[order], candidates[order], moved_by[order]
+        first = np.ones(neighbours.size, dtype=bool)
+        first[1:] = neighbours[1:] != neighbours[:-1]
+        neighbours, candidates, moved_by = neighbours[first], candidates[first], moved_by[first]
+
+        pending = np.concatenate([pending, neighbours[dist[neighbours] == np.inf]])
+        dist[neighbours] = candidates
+        arrived_by[neighbours] = moved_by
+    else:
+        _record_search(expanded, frontier_peak, search_start)
+        return []
+    _record_search(expanded, frontier_peak, search_start)
+
+    path = []
+    while True:
+        layer, rem = divmod(idx, plane)
+        y, x = divmod(rem, local_width)
+        path.append(Cell(x + min_x, y + min_y, layer))
+        code = int(arrived_by[idx])
+        if code < 0:
+            break
+        idx -= int(offsets[code])
+    path.reverse()
+    return path
+
+
+def array_lee_search(grid, start, end, width, height, via_cost, wrong_direction_cost, congestion_map=None, used_cells=None, window=None, corridor=None, landmarks=None):
+    """lee_search run by the array wavefront engine (see _array_wavefront_search); landmarks are not used."""
+    if start == end:
+        return [start]
+    return _array_wavefront_search(grid, [start], [end], width, height, via_cost, wrong_direction_cost,
+                                   congestion_map, used_cells, window, corridor)
+
+
+def array_multi_source_search(grid, sources, targets, width, height, via_cost, wrong_direction_cost, congestion_map=None, used_cells=None, window=None, corridor=None, landmarks=None):
+    """multi_source_search run by the array wavefront engine; landmarks are not used."""
+    if not sources or not targets:
+        return []
+    return _array_wavefront_search(grid, sources, targets, width, height, via_cost, wrong_direction_cost,
+                                   congestion_map, used_cells, window, corridor)
 
 
 # def a_star_search(grid, start, end, width, height, via_cost, wrong_direction_cost, congestion_map=None):
@@ -126,14 +605,5 @@ def a_star_search(grid, start, end, width, height, via_cost, wrong_direction_cos
 
 
 def get_congestion_map(width, height, routed_nets, grid):
-    """Calculate congestion for each grid cell."""
-    congestion = [[[0 for _ in range(width)] for _ in range(height)] for _ in range(2)]
-    
-    # Count how many nets pass through each cell
-    for net_name, path in routed_nets.items():
-        for cell in path:
-            if 0 <= cell.x < width and 0 <= cell.y < height and 0 <= cell.layer < 2:
-                if grid[cell.layer][cell.y][cell.x] != -1:  # Not an obstacle
-                    congestion[cell.layer][cell.y][cell.x] += 1
-    
-    return congestion
+    """Calculate congestion for each grid cell as a (layers, height, width) array."""
+    return grid.congestion(routed_nets)
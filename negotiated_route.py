@@ -0,0 +1,151 @@
+import numpy as np
+
+# Configuration constants
+NEGOTIATION_MAX_ITERATIONS = 30  # Maximum number of negotiation iterations
+PRESENT_COST_INITIAL = 0.5  # Weight of other nets' occupancy in the first iteration
+PRESENT_COST_GROWTH = 1.5  # Factor the present-congestion weight grows by after each iteration
+HISTORY_COST_INCREMENT = 1.0  # History cost added per unit of overuse after each iteration
+NEGOTIATION_STALL_ITERATIONS = 5  # Stop once total overuse has not improved for this many iterations
+
+
+def negotiated_route_all_nets(nets, pins_by_net, grid, width, height, via_cost=VIA_COST,
+                              wrong_direction_cost=WRONG_DIRECTION_COST, max_iterations=NEGOTIATION_MAX_ITERATIONS,
+                              present_cost=PRESENT_COST_INITIAL, present_growth=PRESENT_COST_GROWTH,
+                              history_increment=HISTORY_COST_INCREMENT, stall_iterations=NEGOTIATION_STALL_ITERATIONS,
+                              report=None, **route_options):
+    """Route all nets with PathFinder-style negotiated congestion instead of rip-up.
+
+    While negotiating, nets may share cells; only obstacles and pins block.
+    Each cell's penalty, passed through lee_search's congestion_map hook,
+    is its history cost plus the present weight times the number of other
+    nets using it. After every iteration the history cost of overused cells
+    grows, the present weight is multiplied by present_growth and only the
+    nets touching an overused cell are routed again, until no cell is shared.
+
+    If sharing remains after max_iterations, or overuse has not improved for
+    stall_iterations, the later nets in routing order give up their shared
+    cells and go through rip_up_and_reroute.
+
+    Args:
+        report: Optional list that receives one dict per iteration with the
+            nets routed, overused cells, total overuse and failed nets
+
+    Returns:
+        Dictionary of net names to routed paths
+
+    Raises:
+        ValueError: For a tiled grid; the history and cost maps are dense
+    """
+    if grid.tile_size:
+        raise ValueError("Negotiated routing needs a dense grid (tile_size=0)")
+
+    sorted_nets = order_nets_by_length(nets)
+    order = {net_name: i for i, (net_name, _) in enumerate(sorted_nets)}
+
+    tracker = CongestionTracker(grid)
+    history = np.zeros(grid.shape, dtype=np.float64)
+    cost_map = np.zeros(grid.shape, dtype=np.float64)
+    flat_history = history.reshape(-1)
+    flat_cost = cost_map.reshape(-1)
+
+    def refresh_costs(indices):
+        flat_usage = tracker.usage.reshape(-1)
+        flat_cost[indices] = flat_history[indices] + present_cost * flat_usage[indices]
+
+    profiling = PROFILER.enabled
+    paths = {}
+    failed_nets = set()
+    best_overuse = None
+    stalled = 0
+
+    # Pins stay blocked for every other net throughout negotiation
+    for pins in nets.values():
+        grid.set_states(pins, RoutingGrid.PIN)
+
+    for iteration in range(1, max_iterations + 1):
+        if iteration == 1:
+            to_route = [net_name for net_name, _ in sorted_nets]
+        else:
+            overused = tracker.usage.reshape(-1) > 1
+            to_route = [net_name for net_name, _ in sorted_nets
+                        if net_name in tracker.net_indices and overused[tracker.net_indices[net_name]].any()]
+
+        for net_name in to_route:
+            old_indices = tracker.net_indices.get(net_name)
+            with PROFILER.timed(net_name, "congestion_time"):
+                tracker.release(net_name)
+                if old_indices is not None:
+                    refresh_costs(old_indices)
+            if profiling and old_indices is not None:
+                PROFILER.record_rip_up(net_name)
+
+            path = route_net(net_name, nets, pins_by_net, grid, width, height, via_cost, wrong_direction_cost,
+                             paths, tracker, congestion_map=cost_map, share_cells=True, **route_options)
+
+            if path:
+                paths[net_name] = path
+                with PROFILER.timed(net_name, "congestion_time"):
+                    tracker.commit(net_name, path)
+                    refresh_costs(tracker.net_indices[net_name])
+                failed_nets.discard(net_name)
+            else:
+                # route_net frees a failed net's pins; while negotiating they stay blocked
+                grid.set_states(nets[net_name], RoutingGrid.PIN)
+                paths.pop(net_name, None)
+                failed_nets.add(net_name)
+
+        overuse = np.maximum(tracker.usage.astype(np.int32) - 1, 0)
+        overused_cells = int(np.count_nonzero(overuse))
+        entry = {
+            "iteration": iteration,
+            "nets_routed": len(to_route),
+            "overused_cells": overused_cells,
+            "total_overuse": int(overuse.sum()),
+            "failed_nets": len(failed_nets),
+        }
+        if report is not None:
+            report.append(entry)
+        logger.info("Negotiation iteration %d: routed %d nets, %d overused cells (total overuse %d), %d unroutable",
+                    iteration, entry["nets_routed"], overused_cells, entry["total_overuse"], entry["failed_nets"])
+
+        if overused_cells == 0:
+            break
+
+        if best_overuse is None or entry["total_overuse"] < best_overuse:
+            best_overuse = entry["total_overuse"]
+            stalled = 0
+        else:
+            stalled += 1
+            if stalled >= stall_iterations:
+                logger.info("Negotiation stalled at total overuse %d", best_overuse)
+                break
+
+        history += history_increment * overuse
+        present_cost *= present_growth
+        cost_map[:] = history + present_cost * tracker.usage
+
+    # Legalize: later nets give up cells they still share
+    for net_name in sorted(paths, key=order.get, reverse=True):
+        overused = tracker.usage.reshape(-1) > 1
+        if overused[tracker.net_indices[net_name]].any():
+            tracker.release(net_name)
+            del paths[net_name]
+            failed_nets.add(net_name)
+
+    # Back to the normal grid state: committed routes blocked, unrouted pins free
+    routed_nets = {}
+    for net_name, _ in sorted_nets:
+        if net_name in paths:
+            routed_nets[net_name] = paths[net_name]
+            grid.assign_net(net_name, paths[net_name])
+        else:
+            grid.set_states(nets[net_name], RoutingGrid.EMPTY)
+
+    if failed_nets:
+        failed_nets = sorted(failed_nets, key=order.get)
+        logger.info("\nRip-up and re-route phase - %d failed nets", len(failed_nets))
+        return rip_up_and_reroute(failed_nets, nets, pins_by_net, grid, width, height,
+                                  routed_nets, via_cost, wrong_direction_cost, tracker, **route_options)
+
+    logger.info("\nAll nets routed without overlaps after negotiation")
+    return routed_nets
@@ -0,0 +1,176 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Configuration constants
+PARALLEL_WORKERS = os.cpu_count() or 1  # Worker processes for the first routing pass
+PARALLEL_BBOX_MARGIN = 2  # Cells added around each net's pin bounding box when checking for conflicts
+
+
+def expanded_bounding_box(pins, margin, width, height):
+    """Pin bounding box grown by margin cells and clipped to the grid, as (min_x, min_y, max_x, max_y)."""
+    return (max(min(pin.x for pin in pins) - margin, 0),
+            max(min(pin.y for pin in pins) - margin, 0),
+            min(max(pin.x for pin in pins) + margin, width - 1),
+            min(max(pin.y for pin in pins) + margin, height - 1))
+
+
+def boxes_overlap(a, b):
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def partition_nets_into_batches(sorted_nets, width, height, margin=PARALLEL_BBOX_MARGIN):
+    """Split the routing order into consecutive runs of spatially independent nets.
+
+    A net joins the current batch while its expanded bounding box overlaps
+    none of the boxes already in it; otherwise a new batch is started. Keeping
+    batches consecutive means committing them in order reproduces the serial
+    routing order.
+
+    Returns:
+        List of batches, each a list of net names
+    """
+    batches = []
+    batch = []
+    boxes = []
+    for net_name, pins in sorted_nets:
+        box = expanded_bounding_box(pins, margin, width, height)
+        if batch and any(boxes_overlap(box, other) for other in boxes):
+            batches.append(batch)
+            batch = []
+            boxes = []
+        batch.append(net_name)
+        boxes.append(box)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _route_batch_worker(task):
+    """Route a chunk of one batch against a private copy of the shared grid.
+
+    Every net is routed from the state the batch started with, so the result
+    does not depend on how the batch was split between workers.
+    """
+    cells_name, usage_name, shape, stack, net_names, nets, via_cost, wrong_direction_cost, route_options = task
+    layers, height, width = shape
+
+    cells_shm = shared_memory.SharedMemory(name=cells_name)
+    usage_shm = shared_memory.SharedMemory(name=usage_name)
+    try:
+        shared_cells = np.ndarray(shape, dtype=np.int8, buffer=cells_shm.buf)
+        shared_usage = np.ndarray(shape, dtype=np.int16, buffer=usage_shm.buf)
+
+        grid = RoutingGrid(width, height, stack=stack)
+        tracker = CongestionTracker(grid)
+        tracker.usage[:] = shared_usage
+
+        reset_search_stats()
+        PROFILER.reset()
+        # route_net does not write the grid unless a net fails, so one copy serves the chunk
+        grid.cells[:] = shared_cells
+        results = []
+        for net_name in net_names:
+            path = route_net(net_name, nets, nets, grid, width, height,
+                             via_cost, wrong_direction_cost, {}, tracker, **route_options)
+            if not path:
+                # Restore the pins a failed net freed
+                pin_indices = grid.path_indices(nets[net_name])
+                grid.cells.reshape(-1)[pin_indices] = shared_cells.reshape(-1)[pin_indices]
+            results.append((net_name, path))
+        del shared_cells, shared_usage
+    finally:
+        cells_shm.close()
+        usage_shm.close()
+    return results, dict(SEARCH_STATS), PROFILER.nets if PROFILER.enabled else None
+
+
+def route_all_nets_parallel(nets, pins_by_net, grid, width, height, via_cost=VIA_COST,
+                            wrong_direction_cost=WRONG_DIRECTION_COST, workers=PARALLEL_WORKERS,
+                            margin=PARALLEL_BBOX_MARGIN, **route_options):
+    """Route all nets with the first pass spread over a process pool.
+
+    Nets are grouped into batches of non-overlapping expanded bounding boxes.
+    Each batch is routed in parallel against shared-memory copies of the grid
+    and the congestion tracker, then committed in the original net order.
+    A path that runs into a net committed earlier in the same batch is
+    re-routed serially. Failed nets go through rip_up_and_reroute as usual.
+    Tiled grids are routed serially with route_all_nets.
+    Search counts and profiler counters from the workers are added to
+    SEARCH_STATS and PROFILER.
+    """
+    if grid.tile_size:
+        logger.info("Tiled grids cannot be shared with worker processes; routing serially")
+        return route_all_nets(nets, pins_by_net, grid, width, height, via_cost, wrong_direction_cost, **route_options)
+
+    sorted_nets = order_nets_by_length(nets)
+    batches = partition_nets_into_batches(sorted_nets, width, height, margin)
+
+    routed_nets = {}
+    failed_nets = []
+    tracker = CongestionTracker(grid)
+    conflicts = 0
+
+    cells_shm = shared_memory.SharedMemory(create=True, size=grid.cells.nbytes)
+    usage_shm = shared_memory.SharedMemory(create=True, size=tracker.usage.nbytes)
+    grid.attach_buffer(cells_shm.buf)
+    tracker.attach_buffer(usage_shm.buf)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as pool:
+            for batch in batches:
+                if len(batch) == 1 or workers <= 1:
+                    results = {}
+                else:
+                    chunks = [batch[i::workers] for i in range(min(workers, len(batch)))]
+                    tasks = [(cells_shm.name, usage_shm.name, grid.shape, grid.stack, chunk,
+                              {net_name: nets[net_name] for net_name in chunk},
+                              via_cost, wrong_direction_cost, route_options)
+                             for chunk in chunks]
+                    results = {}
+                    for chunk_results, worker_stats, worker_profile in pool.map(_route_batch_worker, tasks):
+                        for key, value in worker_stats.items():
+                            SEARCH_STATS[key] += value
+                        if worker_profile:
+                            PROFILER.merge(worker_profile)
+                        # Workers return Routes (pickled as their segments) or [] for a failed net
+                        results.update(chunk_results)
+
+                # Commit in the original order, checking against nets committed in this batch
+                claimed = set()
+                for net_name in batch:
+                    logger.debug("Routing %s...", net_name)
+                    path = results.get(net_name)
+                    if path is not None:
+                        indices = grid.path_indices(path)
+                        if path and claimed.intersection(indices.tolist()):
+                            conflicts += 1
+                            logger.debug("Conflict in parallel batch, re-routing %s serially", net_name)
+                            path = None
+                    if path is None:
+                        path = route_net(net_name, nets, pins_by_net, grid, width, height,
+                                         via_cost, wrong_direction_cost, routed_nets, tracker, **route_options)
+                    if path:
+                        commit_net_route(net_name, path, routed_nets, grid, tracker)
+                        claimed.update(grid.path_indices(path).tolist())
+                        logger.debug("Successfully routed %s with %d cells", net_name, len(path))
+                    else:
+                        logger.info("Failed to route %s", net_name)
+                        failed_nets.append(net_name)
+    finally:
+        grid.detach_buffer()
+        tracker.detach_buffer()
+        cells_shm.close()
+        cells_shm.unlink()
+        usage_shm.close()
+        usage_shm.unlink()
+
+    logger.info("Parallel first pass: %d batches, %d conflicts re-routed serially", len(batches), conflicts)
+
+    if failed_nets:
+        logger.info("\nRip-up and re-route phase - %d failed nets", len(failed_nets))
+        return rip_up_and_reroute(failed_nets, nets, pins_by_net, grid, width, height,
+                                  routed_nets, via_cost, wrong_direction_cost, tracker, **route_options)
+
+    return routed_nets
@@ -1,68 +1,210 @@
-import re
 import os
+import numpy as np
 
-def parse_input(file_path):
+MAX_SIZE = None  # Largest accepted grid width or height (None = no limit)
+DENSE_GRID_MAX_CELLS = 1000 * 1000  # Grids with more cells per layer are stored in tiles
+GRID_TILE_SIZE = 64  # Side of a tile in tiled grids
+REACHABILITY_INDEX = True  # Give dense grids a ReachabilityIndex, built when routing first reads it
+LAYER_STACK = LayerStack(("H", "V"))  # Layer 1 horizontal, layer 2 vertical, uniform via cost
+
+
+def scan_tuples(line, start, arity, file_path, line_number):
+    """Scan the parenthesised integer tuples in line[start:] without regular expressions.
+
+    Only whitespace may surround the tuples. arity is the number of fields
+    or a tuple of accepted numbers. Other text, a tuple with the wrong
+    number of fields or a non-integer field raises a ValueError naming the
+    file and line.
+    """
+    arities = (arity,) if isinstance(arity, int) else arity
+    tuples = []
+    chunks = line[start:].split('(')
+    if chunks[0].strip():
+        raise ValueError(f"{file_path}, line {line_number}: unexpected {chunks[0].strip()!r} in {line!r}")
+    for chunk in chunks[1:]:
+        body, closed, rest = chunk.partition(')')
+        if not closed:
+            raise ValueError(f"{file_path}, line {line_number}: unclosed '(' in {line!r}")
+        if rest.strip():
+            raise ValueError(f"{file_path}, line {line_number}: unexpected {rest.strip()!r} in {line!r}")
+        fields = body.split(',')
+        if len(fields) not in arities:
+            raise ValueError(f"{file_path}, line {line_number}: expected {' or '.join(map(str, arities))} values "
+                             f"in '({body})', got {len(fields)}")
+        try:
+            tuples.append(tuple(map(int, fields)))
+        except ValueError:
+            raise ValueError(f"{file_path}, line {line_number}: invalid coordinate '({body})'") from None
+    return tuples
+
+
+# Deletes digits and whitespace, leaving the punctuation of tuple lists
+_TUPLE_SHAPE = str.maketrans('', '', '0123456789 \t\r')
+
+
+def scan_tuple_lines(texts, arity):
+    """scan_tuples over many lines at once, with a few string and array operations in place of one call per line.
+
+    Every text must hold only whitespace and (a, b, ...) tuples of arity
+    non-negative integers.
+
+    Returns:
+        (values, counts): an (n, arity) int64 array of every tuple in
+        order and the number of tuples on each line, or None when some
+        line holds anything else (scan it with scan_tuples for the error)
+    """
+    if not texts:
+        return np.empty((0, arity), dtype=np.int64), np.empty(0, dtype=np.int64)
+    text = '\n'.join(texts) + '\n'
+    shape = text.translate(_TUPLE_SHAPE)
+    if shape.replace('(' + ',' * (arity - 1) + ')', '') != '\n' * len(texts):
+        return None
+    tokens = text.replace('(', ' ').replace(')', ' ').replace(',', ' ').split()
+    if len(tokens) != arity * shape.count('('):
+        return None
+    try:
+        values = np.array(tokens, dtype=np.int64).reshape(-1, arity)
+    except (ValueError, OverflowError):
+        return None
+    marks = np.frombuffer(shape.encode(), dtype=np.uint8)
+    counts = np.diff(np.cumsum(marks == ord('('))[marks == ord('\n')], prepend=0)
+    return values, counts
+
+
+def _check_lines(lines, file_path, width, height, layers):
+    """Scan (line_number, line) OBS and net lines one by one, raising the first line's ValueError."""
+    for line_number, line in sorted(lines):
+        if line.startswith('OBS'):
+            for x, y in scan_tuples(line, 3, 2, file_path, line_number):
+                if not (0 <= x < width and 0 <= y < height):
+                    raise ValueError(f"{file_path}, line {line_number}: obstacle ({x}, {y}) "
+                                     f"outside the {width}x{height} grid")
+        else:
+            for layer, x, y in scan_tuples(line, len(line.split(None, 1)[0]), 3, file_path, line_number):
+                if not 1 <= layer <= layers:
+                    raise ValueError(f"{file_path}, line {line_number}: pin layer {layer} outside 1..{layers}")
+    raise ValueError(f"{file_path}: malformed OBS or net lines")
+
+
+def parse_input(file_path, stack=LAYER_STACK, max_size=MAX_SIZE, tile_size=None, reachability=REACHABILITY_INDEX):
     """Parse the input file to extract grid size, obstacles, and nets.
-    
+
+    The file is streamed line by line. OBS and net lines are gathered and
+    their tuples scanned in bulk once the file is read (see
+    scan_tuple_lines); if any of them is malformed they are scanned again
+    one by one to report it. Obstacles are kept as Rects and rasterized
+    into the grid, one slice assignment per rectangle and one bulk
+    assignment for all single cells:
+
+        OBS (x, y) ...                   single cells on every layer
+        OBS_RECT (x0, y0, x1, y1) ...    inclusive rectangles on every layer
+        OBS_RECT (layer, x0, y0, x1, y1) ...  a rectangle on one layer
+
+    Several rectangles on one OBS_RECT line make up one region.
+
     Args:
         file_path: Path to the input file
-        
+        stack: LayerStack of the grid; pin layers must lie in 1..len(stack)
+        max_size: Largest accepted width or height, None for no limit
+        tile_size: Tile side for a tiled grid, 0 for a dense grid; None
+            tiles grids with more than DENSE_GRID_MAX_CELLS cells per layer
+        reachability: Give a dense grid a ReachabilityIndex over the
+            obstacle map and pins, so routing can reject unreachable pins;
+            it is built the first time routing reads it, not while parsing
+
     Returns:
         A tuple containing:
         - width: Grid width
         - height: Grid height
-        - obstacles: List of obstacle coordinates (x, y)
+        - obstacles: List of obstacle Rects: the OBS_RECT rectangles, then
+          the OBS cells as 1x1 Rects
         - nets: Dictionary of net names to lists of pins
-        - pins_by_net: Dictionary of net names to lists of pins
-        - grid: 3D grid representation [layer][y][x]
+        - pins_by_net: The same dictionary as nets
+        - grid: RoutingGrid holding the cell states of every layer
+
+    Raises:
+        ValueError: If the input is malformed; the message gives the line number
     """
     with open(file_path, 'r') as f:
-        lines = f.readlines()
-
-    # Extract grid size
-    size_line = lines[0].strip()
-    width, height = map(int, size_line.lower().split('x'))
-    
-    MAX_SIZE = 1000
-    if width > MAX_SIZE or height > MAX_SIZE:
-        raise ValueError(f"Grid size {width}x{height} exceeds limit of {MAX_SIZE}x{MAX_SIZE}")
-    
-    # Initialize the grid for both layers (layer 1 and layer 2)
-    # 0 = empty, -1 = obstacle, -2 = already routed
-    grid = [[[0 for _ in range(width)] for _ in range(height)] for _ in range(2)]
-    
-    obstacles = []
+        # Extract grid size
+        size_line = f.readline().strip()
+        try:
+            width, height = map(int, size_line.lower().split('x'))
+        except ValueError:
+            raise ValueError(f"{file_path}, line 1: expected grid size WIDTHxHEIGHT, got {size_line!r}") from None
+
+        if max_size is not None and (width > max_size or height > max_size):
+            raise ValueError(f"Grid size {width}x{height} exceeds limit of {max_size}x{max_size}")
+
+        if tile_size is None:
+            tile_size = GRID_TILE_SIZE if width * height > DENSE_GRID_MAX_CELLS else 0
+
+        # Initialize the grid for every layer of the stack
+        # 0 = empty, -1 = obstacle, -2 = already routed
+        grid = RoutingGrid(width, height, stack=stack, tile_size=tile_size)
+
+        obstacles = []
+        cell_lines = []
+        cell_line_numbers = []
+        net_lines = []
+        net_line_numbers = []
+
+        for line_number, line in enumerate(f, start=2):
+            line = line.strip()
+            if not line:
+                continue
+
+            if line.startswith('OBS_RECT'):
+                for fields in scan_tuples(line, 8, (4, 5), file_path, line_number):
+                    layer = None
+                    if len(fields) == 5:
+                        layer, *fields = fields
+                        if not 1 <= layer <= grid.layers:
+                            raise ValueError(f"{file_path}, line {line_number}: obstacle layer {layer} "
+                                             f"outside 1..{grid.layers}")
+                        layer -= 1
+                    x0, y0, x1, y1 = fields
+                    x0, x1 = sorted((x0, x1))
+                    y0, y1 = sorted((y0, y1))
+                    if not (0 <= x0 and x1 < width and 0 <= y0 and y1 < height):
+                        raise ValueError(f"{file_path}, line {line_number}: obstacle rectangle "
+                                         f"({x0}, {y0})-({x1}, {y1}) outside the {width}x{height} grid")
+                    obstacles.append(Rect(x0, y0, x1, y1, layer))
+            elif line.startswith('OBS'):
+                cell_lines.append(line)
+                cell_line_numbers.append(line_number)
+            elif line.startswith('net'):
+                net_lines.append(line)
+                net_line_numbers.append(line_number)
+
+    net_names = [line.split(None, 1)[0] for line in net_lines]
+    cells = scan_tuple_lines([line[3:] for line in cell_lines], 2)
+    pins = scan_tuple_lines([line[len(name):] for name, line in zip(net_names, net_lines)], 3)
+    if (cells is None or pins is None or not (cells[0][:, 0] < width).all() or not (cells[0][:, 1] < height).all()
+            or not ((pins[0][:, 0] >= 1) & (pins[0][:, 0] <= grid.layers)).all()):
+        _check_lines(list(zip(cell_line_numbers, cell_lines)) + list(zip(net_line_numbers, net_lines)),
+                     file_path, width, height, grid.layers)
+
+    # Pins outside the grid are dropped; a net keeps its last line with pins on the grid
+    (pin_layers, pin_xs, pin_ys), counts = pins[0].T, pins[1]
+    on_grid = (pin_xs < width) & (pin_ys < height)
+    pin_cells = list(map(Cell, pin_xs[on_grid].tolist(), pin_ys[on_grid].tolist(),
+                         (pin_layers[on_grid] - 1).tolist()))  # Convert to 0-indexed layers
+    kept = np.bincount(np.repeat(np.arange(len(net_lines)), counts)[on_grid], minlength=len(net_lines))
     nets = {}
-    pins_by_net = {}
-    
-    for line in lines[1:]:
-        line = line.strip()
-        if not line:
-            continue
-            
-        if line.startswith('OBS'):
-            coords = re.findall(r'\((\d+),\s*(\d+)\)', line)
-            for x_str, y_str in coords:
-                x, y = int(x_str), int(y_str)
-                obstacles.append((x, y))
-                # Mark as obstacle on both layers
-                grid[0][y][x] = -1  
-                grid[1][y][x] = -1
-        elif line.startswith('net'):
-            parts = line.split()
-            net_name = parts[0]
-            coords = re.findall(r'\((\d+),\s*(\d+),\s*(\d+)\)', line)
-            
-            
-            pins = []
-            for layer_str, x_str, y_str in coords:
-                layer = int(layer_str) - 1  # Convert to 0-indexed layers
-                x, y = int(x_str), int(y_str)
-                if 0 <= x < width and 0 <= y < height:
-                    pins.append(Cell(x, y, layer))
-            
-            if pins:
-                nets[net_name] = pins
-                pins_by_net[net_name] = pins
-    
-    return width, height, obstacles, nets, pins_by_net, grid
+    start = 0
+    for net_name, count in zip(net_names, kept.tolist()):
+        if count:
+            nets[net_name] = pin_cells[start:start + count]
+        start += count
+
+    # Rasterize the obstacles into the grid
+    grid.mark_rects(obstacles)
+    xs, ys = cells[0].T
+    grid.mark_obstacles(cells[0])
+    xs, ys = xs.tolist(), ys.tolist()
+    obstacles.extend(map(Rect, xs, ys, xs, ys))
+    if reachability and not grid.tile_size:
+        grid.defer_reachability(pin for pins in nets.values() for pin in pins)
+
+    return width, height, obstacles, nets, nets, grid
@@ -0,0 +1,163 @@
+import csv
+import sys
+import json
+import time
+import logging
+import functools
+from contextlib import contextmanager, nullcontext
+
+# Router messages go through this logger; per-net progress is DEBUG, phase summaries INFO
+logger = logging.getLogger("maze_router")
+LOG_LEVEL = logging.INFO
+
+
+def configure_logging(level=LOG_LEVEL):
+    """Send router log messages to stdout as plain lines at the given level."""
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+
+class RoutingProfiler:
+    """Per-net search and timing counters.
+
+    Disabled by default. Every hook is guarded by a check of enabled, so
+    with the profiler off routing pays one attribute lookup per search and
+    per routed net.
+
+    For each net it counts searches, nodes expanded and the largest
+    frontier seen, the number of route_net calls and rip-ups, and splits
+    wall time into search, congestion map building and grid bookkeeping.
+    """
+
+    FIELDS = ("route_calls", "searches", "nodes_expanded", "frontier_peak", "rip_ups",
+              "search_time", "congestion_time", "bookkeeping_time")
+    TIME_FIELDS = ("search_time", "congestion_time", "bookkeeping_time")
+
+    def __init__(self):
+        self.enabled = False
+        self.current_net = None
+        self.nets = {}
+
+    def enable(self, reset=True):
+        if reset:
+            self.reset()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.current_net = None
+        self.nets = {}
+
+    def stats(self, net_name):
+        stats = self.nets.get(net_name)
+        if stats is None:
+            stats = self.nets[net_name] = dict.fromkeys(self.FIELDS, 0)
+        return stats
+
+    def record_search(self, nodes_expanded, frontier_peak, seconds):
+        if self.current_net is None:
+            return
+        stats = self.stats(self.current_net)
+        stats["searches"] += 1
+        stats["nodes_expanded"] += nodes_expanded
+        stats["frontier_peak"] = max(stats["frontier_peak"], frontier_peak)
+        stats["search_time"] += seconds
+
+    def add_time(self, net_name, field, seconds):
+        self.stats(net_name)[field] += seconds
+
+    def merge(self, nets):
+        """Add counters collected elsewhere (e.g. in a worker process) to this profiler."""
+        for net_name, other in nets.items():
+            stats = self.stats(net_name)
+            for field, value in other.items():
+                if field == "frontier_peak":
+                    stats[field] = max(stats[field], value)
+                else:
+                    stats[field] += value
+
+    def record_rip_up(self, net_name):
+        self.stats(net_name)["rip_ups"] += 1
+
+    def timed(self, net_name, field):
+        """Context manager adding the time spent in the block to one of the net's time fields."""
+        if not self.enabled:
+            return _NOT_TIMED
+        return self._timed(net_name, field)
+
+    @contextmanager
+    def _timed(self, net_name, field):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(net_name, field, time.perf_counter() - start)
+
+    @contextmanager
+    def net(self, net_name):
+        """Attribute searches in the block to net_name; time not spent searching
+        or building congestion maps is counted as bookkeeping."""
+        stats = self.stats(net_name)
+        previous = self.current_net
+        self.current_net = net_name
+        accounted = stats["search_time"] + stats["congestion_time"]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stats["route_calls"] += 1
+            stats["bookkeeping_time"] += elapsed - (stats["search_time"] + stats["congestion_time"] - accounted)
+            self.current_net = previous
+
+    def rows(self):
+        """One dictionary per net with its counters and total time, slowest first."""
+        rows = []
+        for net_name, stats in self.nets.items():
+            row = {"net": net_name, **stats}
+            row["total_time"] = sum(stats[field] for field in self.TIME_FIELDS)
+            rows.append(row)
+        rows.sort(key=lambda row: row["total_time"], reverse=True)
+        return rows
+
+    def write_json(self, output_path):
+        with open(output_path, "w") as f:
+            json.dump(self.rows(), f, indent=2)
+
+    def write_csv(self, output_path):
+        with open(output_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=("net",) + self.FIELDS + ("total_time",))
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def summary(self, top_n=10):
+        """Text table of the top_n slowest nets."""
+        lines = [f"{'net':<16}{'time (s)':>10}{'search':>10}{'congest':>10}{'bookkeep':>10}"
+                 f"{'searches':>10}{'nodes':>12}{'frontier':>10}{'rip-ups':>9}"]
+        for row in self.rows()[:top_n]:
+            lines.append(f"{row['net']:<16}{row['total_time']:>10.4f}{row['search_time']:>10.4f}"
+                         f"{row['congestion_time']:>10.4f}{row['bookkeeping_time']:>10.4f}"
+                         f"{row['searches']:>10}{row['nodes_expanded']:>12}{row['frontier_peak']:>10}"
+                         f"{row['rip_ups']:>9}")
+        return "\n".join(lines)
+
+
+_NOT_TIMED = nullcontext()
+PROFILER = RoutingProfiler()
+
+
+def profiled_net(route_function):
+    """Decorator for per-net routing functions: attributes their work to the net being routed."""
+    @functools.wraps(route_function)
+    def wrapper(net_name, *args, **kwargs):
+        if not PROFILER.enabled:
+            return route_function(net_name, *args, **kwargs)
+        with PROFILER.net(net_name):
+            return route_function(net_name, *args, **kwargs)
+    return wrapper
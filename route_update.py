@@ -1,11 +1,22 @@
 import random
 import time
+from collections import OrderedDict
+import numpy as np
 
 # Configuration constants
 VIA_COST = 10  # Cost for switching between layers
 WRONG_DIRECTION_COST = 2  # Cost for routing in non-preferred direction
 MAX_RIP_UP_ITERATIONS = 5  # Maximum number of rip-up iterations
 RIP_UP_THRESHOLD = 3  # Number of failed nets before considering rip-up
+MULTI_SOURCE_SEARCH = False  # Grow multi-pin nets with one wavefront from the whole routed tree
+BIDIRECTIONAL_SEARCH = False  # Search each (source pin, target pin) pair from both ends
+VECTORIZED_SEARCH = False  # Run searches with the NumPy array wavefront engine instead of the A* loop
+SEARCH_WINDOW_MARGIN = None  # Cells around the net's pin bounding box for the first search window (None = whole grid)
+SEARCH_WINDOW_GROWTH = 2  # Factor the window margin grows by after a failed search
+SEARCH_WINDOW_LIMIT = None  # Largest margin tried before giving up on the net (None = grow to the whole grid)
+TILED_SEARCH_WINDOW_MARGIN = 16  # First window margin on tiled grids when SEARCH_WINDOW_MARGIN is None
+ROUTE_CACHE_SIZE = 256  # Ripped-up routes kept for reuse during rip-up and re-route (0 = no cache)
+RIP_UP_NEIGHBOURHOOD = 16  # Cells around a failed net's pin bounding box whose routed nets are rip-up candidates
 import heapq
 
 def select_start_pin_lowest_y_then_x(pins):
@@ -35,20 +46,121 @@ def select_start_pin_lowest_y_then_x(pins):
 
 
 
-def route_net(net_name, nets, pins_by_net, grid, width, height, via_cost=VIA_COST, wrong_direction_cost=WRONG_DIRECTION_COST, routed_nets=None):
-    used_cells = set()
+def search_windows(pins, width, height, margin=SEARCH_WINDOW_MARGIN, growth=SEARCH_WINDOW_GROWTH,
+                   limit=SEARCH_WINDOW_LIMIT):
+    """Yield successively larger search windows around a net's pins.
 
+    Windows are (min_x, min_y, max_x, max_y) boxes: the pin bounding box plus
+    a margin that is multiplied by growth after every failure. The last
+    window yielded is None (the whole grid) unless limit caps the margin first.
+    """
+    if margin is None:
+        yield None
+        return
+
+    min_x = min(pin.x for pin in pins)
+    max_x = max(pin.x for pin in pins)
+    min_y = min(pin.y for pin in pins)
+    max_y = max(pin.y for pin in pins)
+
+    while limit is None or margin <= limit:
+        window = (max(min_x - margin, 0), max(min_y - margin, 0),
+                  min(max_x + margin, width - 1), min(max_y + margin, height - 1))
+        if window == (0, 0, width - 1, height - 1):
+            break
+        yield window
+        margin = max(margin * growth, margin + 1)
+    else:
+        return
+    yield None
+
+
+def window_ring_free(grid, window, usage=None):
+    """Whether the cells along a window's edges are free on every layer, where the edge is not the grid's.
+
+    Free means empty, unused by other nets (usage, a per-cell array like a
+    tracker's) and not masked by the grid's SearchWorkspace. A path that
+    leaves such a window can always come back along its ring instead, so a
+    search that failed inside the window cannot succeed in a larger one.
+    """
+    min_x, min_y, max_x, max_y = window
+    bands = []
+    if min_y > 0:
+        bands.append((min_x, min_y, max_x, min_y))
+    if max_y < grid.height - 1:
+        bands.append((min_x, max_y, max_x, max_y))
+    if min_x > 0:
+        bands.append((min_x, min_y, min_x, max_y))
+    if max_x < grid.width - 1:
+        bands.append((max_x, min_y, max_x, max_y))
+    for band in bands:
+        if np.any(np.asarray(_window_view(grid.cells, band)) != RoutingGrid.EMPTY):
+            return False
+        if usage is not None and np.any(np.asarray(_window_view(usage, band))):
+            return False
+    return not any(min_x <= x <= max_x and min_y <= y <= max_y
+                   and (x in (min_x, max_x) or y in (min_y, max_y)) for x, y, _ in grid.workspace.masked)
+
+
+@profiled_net
+def route_net(net_name, nets, pins_by_net, grid, width, height, via_cost=VIA_COST, wrong_direction_cost=WRONG_DIRECTION_COST, routed_nets=None, tracker=None, multi_source=MULTI_SOURCE_SEARCH,
+              window_margin=SEARCH_WINDOW_MARGIN, window_growth=SEARCH_WINDOW_GROWTH, window_limit=SEARCH_WINDOW_LIMIT,
+              congestion_map=None, share_cells=False, corridors=None, bidirectional=BIDIRECTIONAL_SEARCH,
+              landmarks=None, vectorized=VECTORIZED_SEARCH):
+    """Route one net by repeatedly connecting the routed tree to its nearest unconnected pin.
+
+    With multi_source set, each step is a single wavefront seeded from every
+    cell of the tree so far that stops at the first pin it reaches, instead
+    of one lee_search per (source pin, target pin) pair. With bidirectional
+    set, those pairwise searches use bidirectional_search instead. With
+    vectorized set, every search runs on the array wavefront engine
+    (array_lee_search, array_multi_source_search), which has no per-cell
+    Python loop and pays off on large open windows.
+
+    With window_margin set, searches are confined to the pins' bounding box
+    plus that margin and only widened (see search_windows) when a step fails.
+    On tiled grids searches always start from a window, so they page in only
+    the tiles around the net, and a failed step stops widening once the
+    ring along its window's edges is free (see window_ring_free), since no
+    larger window could then succeed. Only when the windows run out with
+    the ring still blocked is the whole grid searched.
+
+    landmarks (Landmarks built for this grid and these costs) tightens the
+    search heuristic with precomputed landmark distances.
+
+    corridors maps net names to global routing Corridors (see global_route).
+    A net with a corridor is first searched inside it; a step that fails
+    there falls back to the ordinary search windows.
+
+    congestion_map replaces the tracker's usage counts as the per-cell cost
+    penalty, and share_cells lets the net run over cells used by other nets
+    instead of treating them as blocked (both used by negotiated routing).
+
+    When the grid has a ReachabilityIndex, a net whose pins lie in different
+    components of it fails at once without searching.
+
+    The net's pins and tree are kept out of its own searches by the grid's
+    SearchWorkspace mask rather than by marking them on the grid, so a
+    routed net leaves the grid untouched; commit it with assign_net. A net
+    that fails leaves its pins empty.
+
+    Returns the net's tree as a Route, or [] if it could not be routed.
+    """
     # Track cells already used by other nets to prevent overlaps
-    for other_net in routed_nets.values():
-        for cell in other_net:
-            used_cells.add((cell.x, cell.y, cell.layer))
+    if tracker is None:
+        with PROFILER.timed(net_name, "congestion_time"):
+            tracker = CongestionTracker.from_routed_nets(grid, routed_nets or {})
 
     pins = nets[net_name]
     if len(pins) < 2:
-        print(f"Warning: Net {net_name} has fewer than 2 pins. Skipping.")
+        logger.warning("Warning: Net %s has fewer than 2 pins. Skipping.", net_name)
+        return []
+    if grid.reachability is not None and not grid.reachability.connected(pins):
+        logger.debug("Net %s: pins lie in different free regions, not searching", net_name)
         return []
     
     routed_path = []
+    seen = set()
     start_pin = select_start_pin_lowest_y_then_x(pins)
     sources = [start_pin]
 
@@ -57,113 +169,203 @@ def route_net(net_name, nets, pins_by_net, grid, width, height, via_cost=VIA_COS
     targets = [p for p in pins if p != start_pin]
 
     
-    # Temporarily mark pins on grid
-    for pin in pins:
-        grid[pin.layer][pin.y][pin.x] = -3
+    # Keep the net's own pins out of its searches, except as targets
+    workspace = grid.workspace
+    workspace.clear_mask()
+    workspace.mask(pins)
     
-    congestion_map = get_congestion_map(width, height, routed_nets, grid) if routed_nets else None
+    if congestion_map is None:
+        congestion_map = tracker.usage
+    used_cells = None if share_cells else tracker
     
+    tree = [start_pin]
+    if vectorized:
+        pair_search, tree_search = array_lee_search, array_multi_source_search
+    else:
+        pair_search, tree_search = (bidirectional_search if bidirectional else lee_search), multi_source_search
+
+    if window_margin is None and grid.tile_size:
+        window_margin = TILED_SEARCH_WINDOW_MARGIN
+    windows = search_windows(pins, width, height, window_margin, window_growth, window_limit)
+
+    corridor = corridors.get(net_name) if corridors else None
+    if corridor is not None:
+        window = corridor.bounds(width, height)
+    else:
+        window = next(windows, None)
+
     while targets:
         shortest_path = None
         best_source = None
         best_target = None
         
-        for source in sources:
-            for target in targets:
-                grid[target.layer][target.y][target.x] = 0  # unmark target temporarily
-                
-                # path = lee_search(grid, source, target, width, height, via_cost, wrong_direction_cost, congestion_map)
-                path = lee_search(grid, source, target, width, height, via_cost, wrong_direction_cost, congestion_map, used_cells)
+        while True:
+            if multi_source:
+                shortest_path = tree_search(grid, tree, targets, width, height, via_cost,
+                                            wrong_direction_cost, congestion_map, used_cells, window,
+                                            corridor, landmarks)
+                if shortest_path:
+                    best_source = shortest_path[0]
+                    best_target = shortest_path[-1]
+            else:
+                for source in sources:
+                    for target in targets:
+                        # path = lee_search(grid, source, target, width, height, via_cost, wrong_direction_cost, congestion_map)
+                        path = pair_search(grid, source, target, width, height, via_cost, wrong_direction_cost, congestion_map, used_cells, window, corridor, landmarks)
+                        
+                        if path and (shortest_path is None or len(path) < len(shortest_path)):
+                            shortest_path = path
+                            best_source = source
+                            best_target = target
 
-                
-                grid[target.layer][target.y][target.x] = -3  # re-mark target
-                
-                if path and (shortest_path is None or len(path) < len(shortest_path)):
-                    shortest_path = path
-                    best_source = source
-                    best_target = target
+            if shortest_path:
+                break
+            if corridor is not None:
+                # Leave the corridor and continue with the ordinary windows
+                corridor = None
+                window = next(windows, None)
+                continue
+            if window is None:
+                break
+            if grid.tile_size and window_ring_free(grid, window, None if share_cells else tracker.usage):
+                break
+            # Widen the search window and retry; give up once the windows run out
+            window = next(windows, False)
+            if window is False:
+                break
         
         if not shortest_path:
-            # Failed, unmark pins
-            for pin in pins:
-                grid[pin.layer][pin.y][pin.x] = 0
+            # Failed, free the pins
+            workspace.clear_mask()
+            grid.set_states(pins, RoutingGrid.EMPTY)
             return []
         
-        routed_path.extend(shortest_path)
-        
+        # Each connection starts on the tree, so keep only its new cells
         for cell in shortest_path:
-            if (cell.x, cell.y, cell.layer) not in [(p.x, p.y, p.layer) for p in pins]:
-                grid[cell.layer][cell.y][cell.x] = -2
+            if cell not in seen:
+                seen.add(cell)
+                routed_path.append(cell)
+        tree.extend(shortest_path)
+        workspace.mask(shortest_path)
         
         sources.append(best_target)
         targets.remove(best_target)
     
-    for pin in pins:
-        grid[pin.layer][pin.y][pin.x] = -2
-    
-    # Remove duplicates while preserving order
-    unique_path = []
-    seen = set()
-    for cell in routed_path:
-        key = (cell.x, cell.y, cell.layer)
-        if key not in seen:
-            seen.add(key)
-            unique_path.append(cell)
-    
-    return unique_path
+    workspace.clear_mask()
+    return Route.from_cells(routed_path)
+
 
+class RouteCache:
+    """LRU cache of ripped-up routes, reused when the grid around them has not changed.
 
-def clear_net_route(net_name, routed_nets, pins_by_net, grid):
+    Each entry is a net's path stamped with the grid's region_versions of the
+    regions the path crosses, taken once the net has been cleared. While
+    those counters are unchanged no net has been committed or cleared and no
+    obstacle placed there, so the path's cells are still free and the path
+    can be committed again without a search. Paths that cross a cell taken
+    since they were routed (another net's pin) are not cached.
+    """
+
+    def __init__(self, grid, capacity=ROUTE_CACHE_SIZE):
+        self.grid = grid
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def store(self, net_name, path, pins=()):
+        pin_set = set(pins)
+        indices = self.grid.path_indices([cell for cell in path if cell not in pin_set])
+        if np.any(self.grid.cells.reshape(-1)[indices] != RoutingGrid.EMPTY):
+            self.entries.pop(net_name, None)
+            return
+        regions = self.grid.regions_of(self.grid.path_indices(path))
+        self.entries[net_name] = (path, regions, self.grid.region_versions.reshape(-1)[regions])
+        self.entries.move_to_end(net_name)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def lookup(self, net_name):
+        """The net's cached path if its regions are unchanged since it was stored, else None."""
+        entry = self.entries.pop(net_name, None)
+        if entry is not None:
+            path, regions, versions = entry
+            if np.array_equal(self.grid.region_versions.reshape(-1)[regions], versions):
+                self.hits += 1
+                return path
+        self.misses += 1
+        return None
+
+
+def commit_net_route(net_name, path, routed_nets, grid, tracker):
+    """Record a successfully routed net in the routed set, the grid and the tracker."""
+    with PROFILER.timed(net_name, "bookkeeping_time"):
+        routed_nets[net_name] = path
+        grid.assign_net(net_name, path)
+        tracker.commit(net_name, path)
+
+
+def clear_net_route(net_name, routed_nets, pins_by_net, grid, tracker=None):
     """Clear a previously routed net from the grid."""
     if net_name not in routed_nets:
         return
         
-    # Unmark the cells used by this net
-    path = routed_nets[net_name]
-    for cell in path:
-        # Only unmark if it's not a pin
-        is_pin = False
-        for pin in pins_by_net.get(net_name, []):
-            if cell.x == pin.x and cell.y == pin.y and cell.layer == pin.layer:
-                is_pin = True
-                break
-        
-        if not is_pin:
-            grid[cell.layer][cell.y][cell.x] = 0
+    # Unmark the cells owned by this net, keeping its pins blocked
+    with PROFILER.timed(net_name, "bookkeeping_time"):
+        grid.clear_net(net_name, pins_by_net.get(net_name, []), routed_nets[net_name])
+        if tracker is not None:
+            tracker.release(net_name)
     
     # Remove from routed nets
     del routed_nets[net_name]
-    print(f"Cleared route for {net_name}")
+    logger.debug("Cleared route for %s", net_name)
 
-def select_nets_to_rip_up(failed_net_name, routed_nets, nets, width, height, grid):
-    """Select nets to rip up based on congestion and conflicts."""
-    # Calculate congestion
-    congestion = get_congestion_map(width, height, routed_nets, grid)
-    
+def select_nets_to_rip_up(failed_net_name, routed_nets, nets, width, height, grid, tracker=None):
+    """Select nets to rip up based on congestion and conflicts.
+
+    Candidates are the routed nets the grid's region index places within
+    RIP_UP_NEIGHBOURHOOD cells of the failed net's pin bounding box. When
+    the grid's ReachabilityIndex shows the failed net's pins split across
+    components, only the routed nets walling those components off are
+    candidates; none are returned if obstacles alone separate them.
+    """
     # Find path of the failed net (partial routing)
     failed_pins = nets[failed_net_name]
+    if grid.reachability is not None and not grid.reachability.connected(failed_pins):
+        return [net_name for net_name in grid.reachability.blockers(failed_pins)
+                if net_name != failed_net_name and net_name in routed_nets][:3]
+
+    if tracker is None:
+        tracker = CongestionTracker.from_routed_nets(grid, routed_nets)
     
-    # Identify nets that might be causing congestion along the potential path
+    # Routed nets around the failed net are the candidates
+    margin = RIP_UP_NEIGHBOURHOOD
+    nearby = grid.nets_near(min(pin.x for pin in failed_pins) - margin, min(pin.y for pin in failed_pins) - margin,
+                            max(pin.x for pin in failed_pins) + margin, max(pin.y for pin in failed_pins) + margin)
+
+    # Cells near the failed net's pins (Manhattan distance <= 2, same layer), counted per owning net
+    near_pins = []
+    for pin in failed_pins:
+        for dy in range(-2, 3):
+            for dx in range(-2 + abs(dy), 3 - abs(dy)):
+                if 0 <= pin.x + dx < width and 0 <= pin.y + dy < height:
+                    near_pins.append(grid.index(pin.x + dx, pin.y + dy, pin.layer))
+    owners, counts = np.unique(grid.flat_owner[np.array(near_pins, dtype=np.int64)], return_counts=True)
+    near_pin_cells = dict(zip(owners.tolist(), counts.tolist()))
+
     candidate_nets = []
-    
-    # Check all routed nets for potential conflicts
-    for net_name, path in routed_nets.items():
-        conflict_score = 0
-        
+    for net_name in nearby:
+        if net_name not in routed_nets:
+            continue
+
         # Check if this net's path crosses near the pins of the failed net
-        for pin in failed_pins:
-            for cell in path:
-                # Check if the cell is near the pin (Manhattan distance ≤ 2)
-                if (cell.layer == pin.layer and 
-                    abs(cell.x - pin.x) + abs(cell.y - pin.y) <= 2):
-                    conflict_score += 5
+        conflict_score = 5 * near_pin_cells.get(grid.net_ids[net_name], 0)
         
         # Check congestion along this net's path
-        path_congestion = sum(congestion[cell.layer][cell.y][cell.x] for cell in path 
-                             if 0 <= cell.x < width and 0 <= cell.y < height and 0 <= cell.layer < 2)
+        path_congestion = tracker.path_congestion(net_name)
         
         # Consider the net's length too (prefer to rip up shorter nets)
-        path_length = len(path)
+        path_length = len(routed_nets[net_name])
         
         # Calculate a score for ripping up this net
         # Higher score = more likely to be ripped up
@@ -224,44 +426,85 @@ def order_nets_by_length(nets):
     net_lengths.sort(key=lambda x: x[2])
     return [(net_name, pins) for net_name, pins, _ in net_lengths]
 
-def route_all_nets(nets, pins_by_net, grid, width, height, via_cost=VIA_COST, wrong_direction_cost=WRONG_DIRECTION_COST):
-    """Route all nets with rip-up and re-route capability."""
+def route_all_nets(nets, pins_by_net, grid, width, height, via_cost=VIA_COST, wrong_direction_cost=WRONG_DIRECTION_COST, **route_options):
+    """Route all nets with rip-up and re-route capability.
+
+    Extra keyword arguments (e.g. multi_source) are passed on to every route_net call.
+    """
     # Order nets by length
     sorted_nets = order_nets_by_length(nets)
     
     routed_nets = {}
     failed_nets = []
+    tracker = CongestionTracker(grid)
     
     # First pass: route nets in order
     for net_name, pins in sorted_nets:
-        print(f"Routing {net_name}...")
+        logger.debug("Routing %s...", net_name)
         path = route_net(net_name, nets, pins_by_net, grid, width, height, 
-                         via_cost, wrong_direction_cost, routed_nets)
+                         via_cost, wrong_direction_cost, routed_nets, tracker, **route_options)
         if path:
-            routed_nets[net_name] = path
-            print(f"Successfully routed {net_name} with {len(path)} cells")
+            commit_net_route(net_name, path, routed_nets, grid, tracker)
+            logger.debug("Successfully routed %s with %d cells", net_name, len(path))
         else:
-            print(f"Failed to route {net_name}")
+            logger.info("Failed to route %s", net_name)
             failed_nets.append(net_name)
     
     # Rip-up and re-route if there are failed nets
     if failed_nets:
-        print(f"\nRip-up and re-route phase - {len(failed_nets)} failed nets")
+        logger.info("\nRip-up and re-route phase - %d failed nets", len(failed_nets))
         return rip_up_and_reroute(failed_nets, nets, pins_by_net, grid, width, height, 
-                                  routed_nets, via_cost, wrong_direction_cost)
+                                  routed_nets, via_cost, wrong_direction_cost, tracker, **route_options)
     
     return routed_nets
 
 
 def rip_up_and_reroute(failed_nets, nets, pins_by_net, grid, width, height, 
-                       routed_nets, via_cost=VIA_COST, wrong_direction_cost=WRONG_DIRECTION_COST):
-    """Perform rip-up and re-route for failed nets."""
+                       routed_nets, via_cost=VIA_COST, wrong_direction_cost=WRONG_DIRECTION_COST, tracker=None,
+                       route_cache=None, **route_options):
+    """Perform rip-up and re-route for failed nets.
+
+    Ripped-up routes go into route_cache (a RouteCache over the grid, by
+    default of ROUTE_CACHE_SIZE entries) and are committed again without a
+    search when the grid around them is unchanged by the time they are re-routed.
+    """
+    if tracker is None:
+        tracker = CongestionTracker.from_routed_nets(grid, routed_nets)
+    if route_cache is None and ROUTE_CACHE_SIZE:
+        route_cache = RouteCache(grid)
+
+    def reroute(net_names):
+        """Re-route ripped-up nets and return those that failed.
+
+        All cache lookups happen before anything is committed, so one net's
+        restored route does not invalidate its neighbours' stamps; cached
+        routes are committed first and the rest searched around them.
+        """
+        cached = {}
+        if route_cache is not None:
+            for net_name in net_names:
+                path = route_cache.lookup(net_name)
+                if path is not None:
+                    cached[net_name] = path
+        failed = []
+        for net_name in sorted(net_names, key=lambda net_name: net_name not in cached):
+            logger.debug("Re-routing %s...", net_name)
+            path = cached.get(net_name) or route_net(net_name, nets, pins_by_net, grid, width, height, via_cost,
+                                                     wrong_direction_cost, routed_nets, tracker, **route_options)
+            if path:
+                commit_net_route(net_name, path, routed_nets, grid, tracker)
+                logger.debug("Re-routed %s successfully", net_name)
+            else:
+                failed.append(net_name)
+        return failed
+
+    profiling = PROFILER.enabled
     iteration = 0
     max_iterations = MAX_RIP_UP_ITERATIONS
     
     while failed_nets and iteration < max_iterations:
         iteration += 1
-        print(f"\nRip-up iteration {iteration}/{max_iterations}")
+        logger.info("\nRip-up iteration %d/%d", iteration, max_iterations)
         
         # Process each failed net
         current_failed = failed_nets.copy()
@@ -269,52 +512,44 @@ def rip_up_and_reroute(failed_nets, nets, pins_by_net, grid, width, height,
         
         for failed_net_name in current_failed:
             # Select nets to rip up
-            nets_to_rip = select_nets_to_rip_up(failed_net_name, routed_nets, nets, width, height, grid)
+            nets_to_rip = select_nets_to_rip_up(failed_net_name, routed_nets, nets, width, height, grid, tracker)
             
             if not nets_to_rip:
-                print(f"No candidates for rip-up found for {failed_net_name}")
+                logger.info("No candidates for rip-up found for %s", failed_net_name)
                 failed_nets.append(failed_net_name)
                 continue
             
-            print(f"Ripping up nets for {failed_net_name}: {', '.join(nets_to_rip)}")
+            logger.debug("Ripping up nets for %s: %s", failed_net_name, ', '.join(nets_to_rip))
             
-            # Clear the selected nets
+            # Clear the selected nets, then stamp their routes once all of them are gone
+            ripped_paths = {net_name: routed_nets[net_name] for net_name in nets_to_rip if net_name in routed_nets}
             for net_name in nets_to_rip:
-                clear_net_route(net_name, routed_nets, pins_by_net, grid)
+                clear_net_route(net_name, routed_nets, pins_by_net, grid, tracker)
+                if profiling:
+                    PROFILER.record_rip_up(net_name)
+            if route_cache is not None:
+                for net_name, path in ripped_paths.items():
+                    route_cache.store(net_name, path, nets[net_name])
             
             # Try routing the failed net again
-            print(f"Retrying route for {failed_net_name}...")
+            logger.debug("Retrying route for %s...", failed_net_name)
             path = route_net(failed_net_name, nets, pins_by_net, grid, width, height, 
-                             via_cost, wrong_direction_cost, routed_nets)
+                             via_cost, wrong_direction_cost, routed_nets, tracker, **route_options)
             
             if path:
-                routed_nets[failed_net_name] = path
-                print(f"Successfully routed {failed_net_name} after rip-up")
+                commit_net_route(failed_net_name, path, routed_nets, grid, tracker)
+                logger.debug("Successfully routed %s after rip-up", failed_net_name)
                 
                 # Re-route the ripped-up nets
-                for ripped_net in nets_to_rip:
-                    print(f"Re-routing {ripped_net}...")
-                    ripped_path = route_net(ripped_net, nets, pins_by_net, grid, width, height, 
-                                            via_cost, wrong_direction_cost, routed_nets)
-                    if ripped_path:
-                        routed_nets[ripped_net] = ripped_path
-                        print(f"Re-routed {ripped_net} successfully")
-                    else:
-                        print(f"Failed to re-route {ripped_net}")
-                        failed_nets.append(ripped_net)
+                for ripped_net in reroute(nets_to_rip):
+                    logger.info("Failed to re-route %s", ripped_net)
+                    failed_nets.append(ripped_net)
             else:
-                print(f"Still failed to route {failed_net_name} after rip-up")
+                logger.info("Still failed to route %s after rip-up", failed_net_name)
                 failed_nets.append(failed_net_name)
                 
                 # Put back the original routes that were ripped up
-                for net_name in nets_to_rip:
-                    if net_name not in routed_nets:
-                        print(f"Re-routing {net_name}...")
-                        path = route_net(net_name, nets, pins_by_net, grid, width, height, 
-                                         via_cost, wrong_direction_cost, routed_nets)
-                        if path:
-                            routed_nets[net_name] = path
-                            print(f"Re-routed {net_name} successfully")
+                reroute([net_name for net_name in nets_to_rip if net_name not in routed_nets])
         
         # If we've made no progress, try randomizing the order
         if len(failed_nets) == len(current_failed):
@@ -322,10 +557,12 @@ def rip_up_and_reroute(failed_nets, nets, pins_by_net, grid, width, height,
     
     # Final summary
     if failed_nets:
-        print(f"\nAfter rip-up and re-route, {len(failed_nets)} nets still failed:")
+        logger.info("\nAfter rip-up and re-route, %d nets still failed:", len(failed_nets))
         for net in failed_nets:
-            print(f"  - {net}")
+            logger.info("  - %s", net)
     else:
-        print("\nAll nets routed successfully after rip-up and re-route!")
+        logger.info("\nAll nets routed successfully after rip-up and re-route!")
+    if route_cache is not None:
+        logger.info("Route cache: %d hits, %d misses", route_cache.hits, route_cache.misses)
     
-    return routed_nets
+    return routed_nets
@@ -0,0 +1,1081 @@
+from array import array
+import heapq
+from typing import NamedTuple, Optional
+import numpy as np
+
+class Cell(NamedTuple):
+    """A grid cell. Being a tuple, it hashes and compares equal to its plain (x, y, layer) key."""
+    x: int
+    y: int
+    layer: int
+
+    def __repr__(self):
+        return f"({self.layer}, {self.x}, {self.y})"
+
+
+class Rect(NamedTuple):
+    """Inclusive (x0, y0)-(x1, y1) box of obstacle cells on one 0-based layer, or on every layer when layer is None."""
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    layer: Optional[int] = None
+
+
+def cell_index(cell, width, height):
+    """Pack a cell into its flat index ``layer * width * height + y * width + x``."""
+    x, y, layer = cell
+    return layer * width * height + y * width + x
+
+
+def index_to_cell(idx, width, height):
+    """Unpack a flat index produced by cell_index back into a Cell."""
+    layer, rem = divmod(idx, width * height)
+    y, x = divmod(rem, width)
+    return Cell(x, y, layer)
+
+
+class Route:
+    """A routed net stored as straight segments instead of one Cell per cell.
+
+    segments is an (n, 5) int32 array of (layer, x0, y0, x1, y1) rows, each
+    a horizontal or vertical run of cells on one layer from (x0, y0) to
+    (x1, y1) inclusive; a single cell has equal ends. Vias are where
+    consecutive segments change layer. Iterating yields the cells in their
+    original order, so a Route stands in for the cell list it was built
+    from, while its size grows with bends and vias rather than length.
+    """
+
+    def __init__(self, segments=()):
+        self.segments = np.asarray(segments, dtype=np.int32).reshape(-1, 5)
+        self._lengths = np.maximum(np.abs(self.segments[:, 3] - self.segments[:, 1]),
+                                   np.abs(self.segments[:, 4] - self.segments[:, 2])) + 1
+        self._length = int(self._lengths.sum())
+
+    @classmethod
+    def from_cells(cls, cells):
+        """Compress an ordered sequence of (x, y, layer) cells into segments."""
+        segments = []
+        segment = None
+        step = None
+        for x, y, layer in cells:
+            if segment is not None and layer == segment[0]:
+                move = (x - segment[3], y - segment[4])
+                if move == step or (step is None and abs(move[0]) + abs(move[1]) == 1):
+                    segment[3], segment[4] = x, y
+                    step = move
+                    continue
+            segment = [layer, x, y, x, y]
+            segments.append(segment)
+            step = None
+        return cls(segments)
+
+    def __reduce__(self):
+        return Route, (self.segments,)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for layer, x0, y0, x1, y1 in self.segments.tolist():
+            if y0 == y1:
+                for x in range(x0, x1 + (1 if x1 >= x0 else -1), 1 if x1 >= x0 else -1):
+                    yield Cell(x, y0, layer)
+            else:
+                for y in range(y0, y1 + (1 if y1 > y0 else -1), 1 if y1 > y0 else -1):
+                    yield Cell(x0, y, layer)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return list(self)[item]
+        if item < 0:
+            item += self._length
+        if not 0 <= item < self._length:
+            raise IndexError("Route index out of range")
+        ends = np.cumsum(self._lengths)
+        row = int(np.searchsorted(ends, item, side="right"))
+        layer, x0, y0, x1, y1 = self.segments[row].tolist()
+        offset = item - int(ends[row] - self._lengths[row])
+        return Cell(x0 + offset * ((x1 > x0) - (x1 < x0)), y0 + offset * ((y1 > y0) - (y1 < y0)), layer)
+
+    def __eq__(self, other):
+        if isinstance(other, Route):
+            return np.array_equal(self.segments, other.segments)
+        if isinstance(other, (list, tuple)):
+            return len(other) == self._length and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Route({self._length} cells, {len(self.segments)} segments)"
+
+    def coords(self):
+        """(n, 3) int64 array of the cells' (x, y, layer) in order, built without per-cell Python objects."""
+        layer, x0, y0, x1, y1 = self.segments.astype(np.int64).T
+        offsets = np.arange(self._length) - np.repeat(np.cumsum(self._lengths) - self._lengths, self._lengths)
+        xs = np.repeat(x0, self._lengths) + np.repeat(np.sign(x1 - x0), self._lengths) * offsets
+        ys = np.repeat(y0, self._lengths) + np.repeat(np.sign(y1 - y0), self._lengths) * offsets
+        return np.stack([xs, ys, np.repeat(layer, self._lengths)], axis=1)
+
+    def indices(self, width, height):
+        """Flat cell_index values of the cells in order."""
+        xs, ys, layers = self.coords().T
+        return layers * (width * height) + ys * width + xs
+
+    def via_count(self):
+        """Number of vias: consecutive cells on different layers at the same (x, y)."""
+        previous, following = self.segments[:-1], self.segments[1:]
+        return int(np.count_nonzero((previous[:, 0] != following[:, 0]) & (previous[:, 3] == following[:, 1])
+                                    & (previous[:, 4] == following[:, 2])))
+
+
+class LayerStack:
+    """Routing layers from bottom to top.
+
+    Each layer has a preferred direction, "H" or "V": moves along it cost 1
+    and moves across it cost the search's wrong_direction_cost. via_costs
+    gives the cost of a via between layer i and layer i + 1; None uses the
+    search's via_cost for every pair. Vias between non-adjacent layers are
+    stacked single vias and cost their sum.
+    """
+
+    HORIZONTAL = "H"
+    VERTICAL = "V"
+
+    def __init__(self, directions=("H", "V"), via_costs=None):
+        directions = tuple(direction.upper() for direction in directions)
+        if not directions:
+            raise ValueError("A layer stack needs at least one layer")
+        for direction in directions:
+            if direction not in (self.HORIZONTAL, self.VERTICAL):
+                raise ValueError(f"Unknown layer direction {direction!r}, expected 'H' or 'V'")
+        if via_costs is not None and len(via_costs) != len(directions) - 1:
+            raise ValueError(f"{len(directions)} layers need {len(directions) - 1} via costs, got {len(via_costs)}")
+        self.directions = directions
+        self.via_costs = None if via_costs is None else tuple(via_costs)
+
+    @classmethod
+    def alternating(cls, layers, via_costs=None):
+        """Stack of the given number of layers, alternating H, V, H, ... from the bottom."""
+        return cls(tuple("HV"[i % 2] for i in range(layers)), via_costs)
+
+    def __len__(self):
+        return len(self.directions)
+
+    def __repr__(self):
+        return f"LayerStack({self.directions!r}, via_costs={self.via_costs!r})"
+
+    def via_cost(self, lower_layer, default):
+        """Cost of the via between lower_layer and the layer above it."""
+        return default if self.via_costs is None else self.via_costs[lower_layer]
+
+    def moves(self, width, height, via_cost, wrong_direction_cost):
+        """Per-layer lists of (dx, dy, flat index offset, cost) moves, vias included."""
+        plane = width * height
+        layer_moves = []
+        for layer, direction in enumerate(self.directions):
+            if direction == self.HORIZONTAL:
+                x_cost, y_cost = 1, wrong_direction_cost
+            else:
+                x_cost, y_cost = wrong_direction_cost, 1
+            moves = [
+                (1, 0, 1, x_cost),              # Right
+                (-1, 0, -1, x_cost),            # Left
+                (0, 1, width, y_cost),          # Down
+                (0, -1, -width, y_cost),        # Up
+            ]
+            if layer + 1 < len(self.directions):
+                moves.append((0, 0, plane, self.via_cost(layer, via_cost)))        # Via up
+            if layer > 0:
+                moves.append((0, 0, -plane, self.via_cost(layer - 1, via_cost)))   # Via down
+            layer_moves.append(moves)
+        return layer_moves
+
+
+class TiledArray:
+    """Sparse stand-in for a (layers, height, width) NumPy array.
+
+    Storage is a dictionary of tile_size x tile_size tiles spanning every
+    layer, each allocated on its first write; cells of unallocated tiles
+    read as fill. reshape(-1) gives a flat view that takes scalar or
+    index-array reads and writes like a flat ndarray view, window() pages a
+    dense block in from the tiles it overlaps, and np.asarray() builds the
+    whole dense array.
+    """
+
+    def __init__(self, shape, dtype, fill=0, tile_size=64):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.fill = fill
+        self.tile_size = tile_size
+        layers, height, width = self.shape
+        self.plane = width * height
+        self.tiles_x = -(-width // tile_size)
+        self.tiles = {}
+        self._flat = _FlatTiles(self)
+
+    @property
+    def nbytes(self):
+        """Bytes held by allocated tiles."""
+        return sum(tile.nbytes for tile in self.tiles.values())
+
+    def reshape(self, *shape):
+        if shape not in ((-1,), ((-1,),)):
+            raise ValueError("A TiledArray can only be reshaped to a flat view")
+        return self._flat
+
+    def __array__(self, dtype=None, copy=None):
+        layers, height, width = self.shape
+        dense = self.window((0, 0, width - 1, height - 1))
+        return dense if dtype is None else dense.astype(dtype)
+
+    def __getitem__(self, layer):
+        """Dense copy of one layer."""
+        return np.asarray(self)[layer]
+
+    def _new_tile(self, key):
+        tile = self.tiles[key] = np.full((self.shape[0], self.tile_size, self.tile_size), self.fill, self.dtype)
+        return tile
+
+    def _locate(self, index):
+        layer, rem = divmod(index, self.plane)
+        y, x = divmod(rem, self.shape[2])
+        tile_y, row = divmod(y, self.tile_size)
+        tile_x, column = divmod(x, self.tile_size)
+        return tile_y * self.tiles_x + tile_x, layer, row, column
+
+    def get(self, index):
+        key, layer, row, column = self._locate(index)
+        tile = self.tiles.get(key)
+        return self.fill if tile is None else tile.item(layer, row, column)
+
+    def set(self, index, value):
+        key, layer, row, column = self._locate(index)
+        tile = self.tiles.get(key)
+        if tile is None:
+            if value == self.fill:
+                return
+            tile = self._new_tile(key)
+        tile[layer, row, column] = value
+
+    def _groups(self, indices):
+        """Split an index array by tile: yields (tile key, positions, layer, row, column) per tile touched."""
+        keys, layer, row, column = self._locate(indices)
+        order = np.argsort(keys, kind="stable")
+        bounds = np.flatnonzero(np.diff(keys[order])) + 1
+        for positions in np.split(order, bounds):
+            if len(positions):
+                yield int(keys[positions[0]]), positions, layer[positions], row[positions], column[positions]
+
+    def take(self, indices):
+        indices = np.asarray(indices, dtype=np.int64)
+        values = np.full(indices.shape, self.fill, dtype=self.dtype)
+        for key, positions, layer, row, column in self._groups(indices):
+            tile = self.tiles.get(key)
+            if tile is not None:
+                values[positions] = tile[layer, row, column]
+        return values
+
+    def put(self, indices, values):
+        indices = np.asarray(indices, dtype=np.int64)
+        values = np.broadcast_to(np.asarray(values, dtype=self.dtype), indices.shape)
+        for key, positions, layer, row, column in self._groups(indices):
+            tile = self.tiles.get(key)
+            if tile is None:
+                if (values[positions] == self.fill).all():
+                    continue
+                tile = self._new_tile(key)
+            tile[layer, row, column] = values[positions]
+
+    def fill_window(self, window, value, layers=slice(None)):
+        """Set the block inside window, an inclusive (min_x, min_y, max_x, max_y) box, to value on a slice of layers."""
+        min_x, min_y, max_x, max_y = window
+        size = self.tile_size
+        for tile_y in range(min_y // size, max_y // size + 1):
+            y0 = max(min_y, tile_y * size)
+            y1 = min(max_y, tile_y * size + size - 1)
+            for tile_x in range(min_x // size, max_x // size + 1):
+                key = tile_y * self.tiles_x + tile_x
+                tile = self.tiles.get(key)
+                if tile is None:
+                    if value == self.fill:
+                        continue
+                    tile = self._new_tile(key)
+                x0 = max(min_x, tile_x * size)
+                x1 = min(max_x, tile_x * size + size - 1)
+                tile[layers, y0 - tile_y * size:y1 - tile_y * size + 1, x0 - tile_x * size:x1 - tile_x * size + 1] = value
+
+    def window(self, window):
+        """Dense copy of the block inside window, an inclusive (min_x, min_y, max_x, max_y) box."""
+        min_x, min_y, max_x, max_y = window
+        size = self.tile_size
+        block = np.full((self.shape[0], max_y - min_y + 1, max_x - min_x + 1), self.fill, self.dtype)
+        for tile_y in range(min_y // size, max_y // size + 1):
+            y0 = max(min_y, tile_y * size)
+            y1 = min(max_y, tile_y * size + size - 1)
+            for tile_x in range(min_x // size, max_x // size + 1):
+                tile = self.tiles.get(tile_y * self.tiles_x + tile_x)
+                if tile is None:
+                    continue
+                x0 = max(min_x, tile_x * size)
+                x1 = min(max_x, tile_x * size + size - 1)
+                block[:, y0 - min_y:y1 - min_y + 1, x0 - min_x:x1 - min_x + 1] = \
+                    tile[:, y0 - tile_y * size:y1 - tile_y * size + 1, x0 - tile_x * size:x1 - tile_x * size + 1]
+        return block
+
+
+class _FlatTiles:
+    """Flat-index view of a TiledArray."""
+
+    def __init__(self, array):
+        self.array = array
+
+    def __len__(self):
+        return self.array.shape[0] * self.array.plane
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self.array.get(int(index))
+        return self.array.take(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, (int, np.integer)):
+            self.array.set(int(index), value)
+        else:
+            self.array.put(index, value)
+
+
+class RoutingGrid:
+    """Routing grid backed by a contiguous int8 array of shape (layers, height, width).
+
+    Cell states: 0 = empty, -1 = obstacle, -2 = already routed, -3 = pin.
+    A parallel int32 array records which net owns each routed cell (-1 = none).
+    ``grid[layer][y][x]`` indexing is kept for compatibility with the old nested lists.
+    The layer count and per-layer costs come from stack, a LayerStack; without
+    one, the grid gets layers layers alternating between H and V.
+
+    With tile_size set, both arrays are TiledArrays instead, so memory grows
+    with the tiles holding obstacles, pins or routes rather than with the
+    grid area.
+
+    region_versions holds one change counter per REGION_SIZE square region,
+    bumped whenever obstacles are placed or a net is assigned or cleared
+    there. The same events keep reachability, an optional ReachabilityIndex,
+    up to date once it is built; defer_reachability puts off building it
+    until it is first read. set_state/set_states do neither, since they only mark the
+    pins of a net that failed or is being negotiated.
+
+    region_nets maps each region to the ids of the nets with cells there and
+    net_regions each net id to its regions, kept by assign_net and clear_net,
+    so nets_near finds the nets around a box without visiting every route.
+
+    workspace is the SearchWorkspace every search on this grid reuses. It
+    also masks the pins and partial tree of the net being routed, so
+    route_net leaves the grid unchanged while it searches and a routed net
+    reaches the grid only through assign_net.
+    """
+
+    EMPTY = 0
+    OBSTACLE = -1
+    ROUTED = -2
+    PIN = -3
+    REGION_SIZE = 16
+
+    def __init__(self, width, height, layers=2, stack=None, tile_size=None):
+        if stack is None:
+            stack = LayerStack.alternating(layers)
+        layers = len(stack)
+        self.width = width
+        self.height = height
+        self.stack = stack
+        self.layers = layers
+        self.plane = width * height
+        self.size = layers * self.plane
+        self.tile_size = tile_size
+        self.cells = self.new_array(np.int8, self.EMPTY)
+        self.owner = self.new_array(np.int32, -1)
+        # Flat views sharing memory with the arrays; indexing them yields plain ints
+        self.flat = _flat_view(self.cells)
+        self.flat_owner = self.owner.reshape(-1)
+        self.net_ids = {}
+        self.net_names = []
+        self.region_versions = np.zeros((-(-height // self.REGION_SIZE), -(-width // self.REGION_SIZE)),
+                                        dtype=np.int64)
+        self.region_nets = {}
+        self.net_regions = {}
+        self._reachability = None
+        self._reachability_pins = None
+        self.workspace = SearchWorkspace()
+
+    @property
+    def shape(self):
+        return self.cells.shape
+
+    @property
+    def reachability(self):
+        """The grid's ReachabilityIndex or None, built here first when defer_reachability asked for one."""
+        if self._reachability_pins is not None:
+            pins, self._reachability_pins = self._reachability_pins, None
+            self._reachability = ReachabilityIndex(self, pins)
+        return self._reachability
+
+    @reachability.setter
+    def reachability(self, index):
+        self._reachability = index
+        self._reachability_pins = None
+
+    def defer_reachability(self, pins):
+        """Give the grid a ReachabilityIndex over pins, built from the grid as it is when first read."""
+        self._reachability = None
+        self._reachability_pins = list(pins)
+
+    @property
+    def nbytes(self):
+        """Bytes of cell state and ownership storage."""
+        return self.cells.nbytes + self.owner.nbytes
+
+    def __getitem__(self, layer):
+        return self.cells[layer]
+
+    def new_array(self, dtype, fill=0):
+        """Per-cell array in this grid's storage layout: dense, or tiled like the grid."""
+        shape = (self.layers, self.height, self.width)
+        if self.tile_size:
+            return TiledArray(shape, dtype, fill, self.tile_size)
+        return np.full(shape, fill, dtype=dtype)
+
+    def attach_buffer(self, buffer):
+        """Move the cell states into an external buffer (e.g. shared memory) and keep using it there."""
+        if self.tile_size:
+            raise ValueError("A tiled grid cannot be moved into an external buffer")
+        cells = np.ndarray(self.shape, dtype=np.int8, buffer=buffer)
+        cells[:] = self.cells
+        self.cells = cells
+        self.flat = memoryview(cells.reshape(-1))
+
+    def detach_buffer(self):
+        """Copy the cell states back into private memory so the external buffer can be released."""
+        self.flat.release()
+        self.cells = self.cells.copy()
+        self.flat = memoryview(self.cells.reshape(-1))
+
+    def index(self, x, y, layer):
+        return layer * self.plane + y * self.width + x
+
+    def cell_index(self, cell):
+        x, y, layer = cell
+        return layer * self.plane + y * self.width + x
+
+    def cell_at(self, idx):
+        return index_to_cell(idx, self.width, self.height)
+
+    def path_indices(self, path):
+        """Flat indices of the cells in a path (a Route or a sequence of cells) as an int array."""
+        if isinstance(path, Route):
+            return path.indices(self.width, self.height)
+        plane, width = self.plane, self.width
+        return np.fromiter((layer * plane + y * width + x for x, y, layer in path),
+                           dtype=np.int64, count=len(path))
+
+    def regions_of(self, indices):
+        """Distinct flat region_versions indices of the regions holding the given flat cell indices."""
+        y, x = np.divmod(np.asarray(indices, dtype=np.int64) % self.plane, self.width)
+        return np.unique(y // self.REGION_SIZE * self.region_versions.shape[1] + x // self.REGION_SIZE)
+
+    def bump_regions(self, indices):
+        """Bump the change counters of the regions holding the given flat indices and return those regions."""
+        regions = self.regions_of(indices)
+        self.region_versions.reshape(-1)[regions] += 1
+        return regions
+
+    def nets_near(self, min_x, min_y, max_x, max_y):
+        """Names of the nets with routed cells in the regions overlapping an inclusive cell box, by net id."""
+        size = self.REGION_SIZE
+        columns = self.region_versions.shape[1]
+        net_ids = set()
+        for region_y in range(max(min_y, 0) // size, min(max_y, self.height - 1) // size + 1):
+            for region_x in range(max(min_x, 0) // size, min(max_x, self.width - 1) // size + 1):
+                net_ids.update(self.region_nets.get(region_y * columns + region_x, ()))
+        return [self.net_names[net_id] for net_id in sorted(net_ids)]
+
+    def get_state(self, cell):
+        return self.flat[self.cell_index(cell)]
+
+    def set_state(self, cell, state):
+        self.flat[self.cell_index(cell)] = state
+
+    def set_states(self, cells, state):
+        if cells:
+            self.cells.reshape(-1)[self.path_indices(cells)] = state
+
+    def mark_obstacle(self, x, y, layer=None):
+        """Block a cell on one layer, or on every layer when layer is None."""
+        for obstacle_layer in (range(self.layers) if layer is None else [layer]):
+            self.flat[self.index(x, y, obstacle_layer)] = self.OBSTACLE
+        self.bump_regions([self.index(x, y, 0)])
+        if self._reachability is not None:
+            self._reachability.block(np.array([self.index(x, y, obstacle_layer)
+                                              for obstacle_layer in (range(self.layers) if layer is None else [layer])]))
+
+    def mark_obstacles(self, coords):
+        """Block a list or (n, 2) array of (x, y) cells on every layer with one bulk assignment."""
+        if len(coords):
+            xs, ys = np.array(coords, dtype=np.int64).T
+            indices = np.arange(self.layers, dtype=np.int64)[:, None] * self.plane + ys * self.width + xs
+            self.cells.reshape(-1)[indices.reshape(-1)] = self.OBSTACLE
+            self.bump_regions(indices[0])
+            if self._reachability is not None:
+                self._reachability.block(indices.reshape(-1))
+
+    def mark_rects(self, rects):
+        """Block Rects of cells with one slice assignment per rectangle.
+
+        Single cells on every layer are gathered into one mark_obstacles call.
+        """
+        self.mark_obstacles([(rect.x0, rect.y0) for rect in rects
+                             if rect.layer is None and rect.x0 == rect.x1 and rect.y0 == rect.y1])
+        size = self.REGION_SIZE
+        for rect in rects:
+            if rect.layer is None and rect.x0 == rect.x1 and rect.y0 == rect.y1:
+                continue
+            layers = slice(None) if rect.layer is None else slice(rect.layer, rect.layer + 1)
+            if self.tile_size:
+                self.cells.fill_window((rect.x0, rect.y0, rect.x1, rect.y1), self.OBSTACLE, layers)
+            else:
+                self.cells[layers, rect.y0:rect.y1 + 1, rect.x0:rect.x1 + 1] = self.OBSTACLE
+            self.region_versions[rect.y0 // size:rect.y1 // size + 1, rect.x0 // size:rect.x1 // size + 1] += 1
+            if self._reachability is not None:
+                layer_range = np.arange(self.layers, dtype=np.int64)[layers]
+                ys, xs = np.mgrid[rect.y0:rect.y1 + 1, rect.x0:rect.x1 + 1]
+                self._reachability.block((layer_range[:, None] * self.plane
+                                         + (ys * self.width + xs).reshape(-1)).reshape(-1))
+
+    def obstacle_mask(self):
+        return np.asarray(self.cells) == self.OBSTACLE
+
+    def routed_mask(self):
+        return np.asarray(self.cells) == self.ROUTED
+
+    def net_id(self, net_name):
+        if net_name not in self.net_ids:
+            self.net_ids[net_name] = len(self.net_names)
+            self.net_names.append(net_name)
+        return self.net_ids[net_name]
+
+    def net_mask(self, net_name):
+        """Boolean mask of the cells owned by a net."""
+        if net_name not in self.net_ids:
+            return np.zeros(self.shape, dtype=bool)
+        return np.asarray(self.owner) == self.net_ids[net_name]
+
+    def assign_net(self, net_name, path):
+        """Record a committed route: mark its cells routed and owned by the net."""
+        if not path:
+            return
+        indices = self.path_indices(path)
+        self.cells.reshape(-1)[indices] = self.ROUTED
+        net_id = self.net_id(net_name)
+        self.flat_owner[indices] = net_id
+        regions = self.bump_regions(indices).tolist()
+        self.net_regions[net_id] = self.net_regions.get(net_id, set()).union(regions)
+        for region in regions:
+            self.region_nets.setdefault(region, set()).add(net_id)
+        if self._reachability is not None:
+            self._reachability.block(indices)
+
+    def clear_net(self, net_name, pins=(), path=None):
+        """Free every cell owned by a net, leaving its pins marked as routed.
+
+        When the net's path is given only its cells are visited, otherwise
+        the whole ownership array is scanned.
+        """
+        if path is None:
+            indices = np.flatnonzero(self.net_mask(net_name))
+            self.cells.reshape(-1)[indices] = self.EMPTY
+            self.flat_owner[indices] = -1
+        elif net_name in self.net_ids:
+            indices = self.path_indices(path)
+            indices = indices[self.flat_owner[indices] == self.net_ids[net_name]]
+            self.cells.reshape(-1)[indices] = self.EMPTY
+            self.flat_owner[indices] = -1
+        else:
+            indices = ()
+        self.bump_regions(indices)
+        for region in self.net_regions.pop(self.net_ids.get(net_name), ()):
+            self.region_nets[region].discard(self.net_ids[net_name])
+        if self._reachability is not None:
+            self._reachability.free(np.asarray(indices, dtype=np.int64))
+        for pin in pins:
+            self.set_state(pin, self.ROUTED)
+
+    def congestion(self, routed_nets):
+        """Count how many routed paths pass through each non-obstacle cell."""
+        paths = [self.path_indices(path) for path in routed_nets.values() if path]
+        if not paths:
+            return np.zeros(self.shape, dtype=np.int16)
+        counts = np.bincount(np.concatenate(paths), minlength=self.size).astype(np.int16)
+        counts = counts.reshape(self.shape)
+        counts[self.obstacle_mask()] = 0
+        return counts
+
+
+class CongestionTracker:
+    """Per-cell occupancy counts kept up to date as nets are committed and ripped up.
+
+    ``usage`` is the congestion map handed to lee_search, and the tracker
+    itself can be passed as ``used_cells``. Committing or releasing a net
+    only touches the cells of its path.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.usage = grid.new_array(np.int16)
+        self.flat_usage = _flat_view(self.usage)
+        self.net_indices = {}
+
+    def attach_buffer(self, buffer):
+        """Move the usage counts into an external buffer (e.g. shared memory) and keep using it there."""
+        if self.grid.tile_size:
+            raise ValueError("Tiled usage counts cannot be moved into an external buffer")
+        usage = np.ndarray(self.usage.shape, dtype=np.int16, buffer=buffer)
+        usage[:] = self.usage
+        self.usage = usage
+        self.flat_usage = memoryview(usage.reshape(-1))
+
+    def detach_buffer(self):
+        """Copy the usage counts back into private memory so the external buffer can be released."""
+        self.flat_usage.release()
+        self.usage = self.usage.copy()
+        self.flat_usage = memoryview(self.usage.reshape(-1))
+
+    @classmethod
+    def from_routed_nets(cls, grid, routed_nets):
+        tracker = cls(grid)
+        for net_name, path in routed_nets.items():
+            tracker.commit(net_name, path)
+        return tracker
+
+    def commit(self, net_name, path):
+        """Add a routed net's cells to the occupancy counts."""
+        self.release(net_name)
+        if not path:
+            return
+        indices = np.unique(self.grid.path_indices(path))
+        self.usage.reshape(-1)[indices] += 1
+        self.net_indices[net_name] = indices
+
+    def release(self, net_name):
+        """Remove a ripped-up net's cells from the occupancy counts."""
+        indices = self.net_indices.pop(net_name, None)
+        if indices is not None:
+            self.usage.reshape(-1)[indices] -= 1
+
+    def path_congestion(self, net_name):
+        """Sum of the occupancy counts along a committed net's path."""
+        indices = self.net_indices.get(net_name)
+        if indices is None:
+            return 0
+        return int(self.usage.reshape(-1)[indices].sum())
+
+    def __contains__(self, cell):
+        return self.flat_usage[self.grid.cell_index(cell)] > 0
+
+
+def _label_components(passable):
+    """Connected components of a (layers, height, width) boolean array under planar moves and vias.
+
+    Returns:
+        Flat int64 array with the smallest flat index of each passable
+        cell's component, -1 for cells that are not passable
+    """
+    index = np.arange(passable.size).reshape(passable.shape)
+    heads = []
+    tails = []
+    for a, b in (((slice(None), slice(None), slice(None, -1)), (slice(None), slice(None), slice(1, None))),
+                 ((slice(None), slice(None, -1)), (slice(None), slice(1, None))),
+                 ((slice(None, -1),), (slice(1, None),))):
+        both = passable[a] & passable[b]
+        heads.append(index[a][both])
+        tails.append(index[b][both])
+    heads = np.concatenate(heads)
+    tails = np.concatenate(tails)
+
+    # Hook the larger label of every edge onto the smaller one, then flatten by pointer jumping
+    labels = np.arange(passable.size)
+    while True:
+        head_labels = labels[heads]
+        tail_labels = labels[tails]
+        differ = head_labels != tail_labels
+        if not differ.any():
+            break
+        head_labels = head_labels[differ]
+        tail_labels = tail_labels[differ]
+        np.minimum.at(labels, np.maximum(head_labels, tail_labels), np.minimum(head_labels, tail_labels))
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    labels[~passable.reshape(-1)] = -1
+    return labels
+
+
+class ReachabilityIndex:
+    """Connected components of the cells a search could ever enter.
+
+    Passable cells are those that are neither obstacles nor part of a
+    committed route, plus every pin (a net's own pins are always enterable
+    and unrouted nets' pins are free). labels holds a label per cell, -1 for
+    blocked cells, and aliases maps the labels of merged components onto
+    the label they were merged into; components() resolves them. Being a
+    superset of what any search may enter, pins in different components
+    can never be connected, while pins in one component may still fail
+    (windows, corridors, the net's own route).
+
+    The grid keeps the index current: committing a route labels a window
+    around it, growing the window only while the route may have split a
+    component; clearing a route merges the components its cells join by
+    aliasing their labels, without visiting their cells.
+    """
+
+    WINDOW_MARGIN = 2  # Cells around a changed route that are relabelled
+
+    def __init__(self, grid, pins=()):
+        self.grid = grid
+        self.shape = grid.shape
+        self.pin_mask = np.zeros(grid.size, dtype=bool)
+        if pins:
+            self.pin_mask[grid.path_indices(list(pins))] = True
+        self.passable = (np.asarray(grid.cells).reshape(-1) == RoutingGrid.EMPTY) | self.pin_mask
+        self.labels = _label_components(self.passable.reshape(self.shape))
+        self.aliases = {}
+        self.next_label = grid.size
+
+    def _root(self, label):
+        """The label a cell label resolves to through the aliases, compressing the chain."""
+        root = label
+        while root in self.aliases:
+            root = self.aliases[root]
+        while label != root:
+            self.aliases[label], label = root, self.aliases[label]
+        return root
+
+    def components(self, indices=None):
+        """Component ids (resolved labels) of the given flat indices, or of every cell."""
+        labels = self.labels if indices is None else self.labels[indices]
+        if not self.aliases:
+            return labels
+        unique, inverse = np.unique(labels, return_inverse=True)
+        roots = np.array([self._root(label) for label in unique.tolist()], dtype=labels.dtype)
+        return roots[inverse].reshape(labels.shape)
+
+    def connected(self, cells):
+        """False when the cells lie in different components, so no search can join them.
+
+        Cells the index holds as blocked (e.g. pins it was not given) are
+        not judged, and the answer is then True.
+        """
+        labels = self.components(self.grid.path_indices(cells))
+        return bool(np.all(labels == labels[0]) or np.any(labels < 0))
+
+    def _neighbours(self, indices):
+        """Distinct passable cells one planar move or via away from the given flat indices."""
+        layers, height, width = self.shape
+        layer, rem = np.divmod(indices, self.grid.plane)
+        y, x = np.divmod(rem, width)
+        neighbours = [indices[x > 0] - 1, indices[x < width - 1] + 1,
+                      indices[y > 0] - width, indices[y < height - 1] + width,
+                      indices[layer > 0] - self.grid.plane, indices[layer < layers - 1] + self.grid.plane]
+        neighbours = np.unique(np.concatenate(neighbours))
+        return neighbours[self.passable[neighbours]]
+
+    def _window(self, indices, margin=WINDOW_MARGIN):
+        """Label the window of margin cells around the given cells.
+
+        Returns:
+            (local labels, the window's flat grid indices, local labels that
+            reach an edge of the window inside the grid and so may continue
+            beyond it)
+        """
+        layers, height, width = self.shape
+        y, x = np.divmod(indices % self.grid.plane, width)
+        top, bottom = max(int(y.min()) - margin, 0), min(int(y.max()) + margin, height - 1)
+        left, right = max(int(x.min()) - margin, 0), min(int(x.max()) + margin, width - 1)
+        cells = (np.arange(layers)[:, None, None] * self.grid.plane + np.arange(top, bottom + 1)[:, None] * width
+                 + np.arange(left, right + 1)).reshape(-1)
+        local = _label_components(self.passable.reshape(self.shape)[:, top:bottom + 1, left:right + 1])
+        box = local.reshape(layers, bottom - top + 1, right - left + 1)
+        edges = [box[:, 0, :]] if top > 0 else []
+        edges += [box[:, -1, :]] if bottom < height - 1 else []
+        edges += [box[:, :, 0]] if left > 0 else []
+        edges += [box[:, :, -1]] if right < width - 1 else []
+        open_labels = np.unique(np.concatenate([edge.reshape(-1) for edge in edges])) if edges else local[:0]
+        return local, cells, open_labels
+
+    def block(self, indices):
+        """Remove cells taken by a committed route or an obstacle; pins stay passable."""
+        indices = np.asarray(indices, dtype=np.int64)
+        indices = indices[self.passable[indices] & ~self.pin_mask[indices]]
+        if indices.size == 0:
+            return
+        affected = np.unique(self.components(indices))
+        self.passable[indices] = False
+        self.labels[indices] = -1
+
+        neighbours = self._neighbours(indices)
+        components = self.components(neighbours)
+        for label in affected:
+            self._split(indices, neighbours[components == label])
+
+    def _split(self, indices, members):
+        """Relabel the pieces a component falls into once the given cells are removed from it.
+
+        members are the component's cells next to the removed ones; every
+        piece holds some of them. A piece that lies wholly inside the window
+        around the removed cells gets a fresh label; the window grows while
+        two or more pieces reach its edge, and the last piece keeps the old label.
+        """
+        margin = self.WINDOW_MARGIN
+        while True:
+            local, cells, open_labels = self._window(indices, margin)
+            pieces = local[np.searchsorted(cells, members)]
+            groups = np.unique(pieces)
+            if groups.size < 2:
+                return
+            closed = groups[~np.isin(groups, open_labels)]
+            if closed.size == groups.size:
+                closed = closed[1:]
+            for piece in closed:
+                self.labels[cells[local == piece]] = self.next_label
+                self.next_label += 1
+            if groups.size - closed.size < 2:
+                return
+            members = members[~np.isin(pieces, closed)]
+            margin *= 4
+
+    def free(self, indices):
+        """Add cells released by a cleared route, merging the components they join."""
+        indices = np.asarray(indices, dtype=np.int64)
+        indices = indices[~self.passable[indices]]
+        if indices.size == 0:
+            return
+        self.passable[indices] = True
+        local, cells, _ = self._window(indices)
+        freed_local = local[np.searchsorted(cells, indices)]
+        for local_label in np.unique(freed_local):
+            joined = cells[local == local_label]
+            labels = self.components(joined)
+            existing = np.unique(labels[labels >= 0])
+            if existing.size:
+                label = int(existing[0])
+                for merged in existing[1:].tolist():
+                    self.aliases[merged] = label
+            else:
+                label = self.next_label
+                self.next_label += 1
+            self.labels[joined] = label
+
+    def blockers(self, pins):
+        """Names of the routed nets bordering the components the pins are split across.
+
+        Nets bordering more of those components come first, then nets with
+        more bordering cells; empty when the pins share one component.
+        """
+        labels = np.unique(self.components(self.grid.path_indices(pins)))
+        if labels.size < 2:
+            return []
+
+        # Routed cells lie in the regions the grid's region index holds nets for
+        layers, height, width = self.shape
+        plane = self.grid.plane
+        size = self.grid.REGION_SIZE
+        regions = np.array([region for region, net_ids in self.grid.region_nets.items() if net_ids], dtype=np.int64)
+        if regions.size == 0:
+            return []
+        region_y, region_x = np.divmod(regions, self.grid.region_versions.shape[1])
+        ys = (region_y[:, None] * size + np.arange(size))[:, :, None]
+        xs = (region_x[:, None] * size + np.arange(size))[:, None, :]
+        planar = (ys * width + xs)[(ys < height) & (xs < width)]
+        routed = (np.arange(layers)[:, None] * plane + planar).reshape(-1)
+        owner = np.asarray(self.grid.owner).reshape(-1)
+        routed = routed[owner[routed] >= 0]
+
+        # (routed cell, component) pairs for the routed cells next to those components, packed into one key
+        layer, rem = np.divmod(routed, plane)
+        y, x = np.divmod(rem, width)
+        pairs = []
+        for valid, offset in ((x < width - 1, 1), (x > 0, -1), (y < height - 1, width), (y > 0, -width),
+                              (layer < layers - 1, plane), (layer > 0, -plane)):
+            cell = routed[valid]
+            label = self.components(cell + offset)
+            touching = np.isin(label, labels)
+            pairs.append(cell[touching] * labels.size + np.searchsorted(labels, label[touching]))
+        cells, components = np.divmod(np.unique(np.concatenate(pairs)), labels.size)
+
+        net_ids, cell_counts = np.unique(owner[cells], return_counts=True)
+        component_counts = np.unique(np.unique(owner[cells].astype(np.int64) * labels.size + components) // labels.size,
+                                     return_counts=True)[1]
+        ranked = sorted(zip(net_ids.tolist(), component_counts.tolist(), cell_counts.tolist()),
+                        key=lambda item: (-item[1], -item[2]))
+        return [self.grid.net_names[net_id] for net_id, _, _ in ranked]
+
+
+def _flat_view(array):
+    """1-D memoryview over a NumPy array so scalar reads return plain Python numbers."""
+    if isinstance(array, TiledArray):
+        return array.reshape(-1)
+    return memoryview(np.ascontiguousarray(array).reshape(-1))
+
+
+def _window_view(array, window):
+    """Flat memoryview of the (layers, y, x) block of array inside an inclusive window.
+
+    Tiled arrays page in only the tiles the window overlaps; a dense array
+    is not copied when the window covers all of it.
+    """
+    min_x, min_y, max_x, max_y = window
+    if isinstance(array, TiledArray):
+        block = array.window(window)
+    else:
+        block = np.asarray(array)[:, min_y:max_y + 1, min_x:max_x + 1]
+    return memoryview(np.ascontiguousarray(block).reshape(-1))
+
+
+class Landmarks:
+    """Landmark (ALT) distance tables over a grid's obstacle map.
+
+    For count landmark cells, picked farthest-first, costs holds the cost of
+    the cheapest path from the landmark to every cell with only obstacles
+    blocked (obstacle cells get a cost but are not expanded, since a target
+    may be one). Searches only add blocked cells and congestion, so by the
+    triangle inequality |cost(L, t) - cost(L, v)| bounds the cost from v to
+    t from below. The tables are valid for the via_cost and
+    wrong_direction_cost they were built with and stay valid when obstacles
+    are added, but not when obstacles are removed.
+    """
+
+    def __init__(self, grid, via_cost, wrong_direction_cost, count=4):
+        if grid.tile_size:
+            raise ValueError("Landmarks need a dense grid")
+        self.via_cost = via_cost
+        self.wrong_direction_cost = wrong_direction_cost
+        self.width = grid.width
+        self.plane = grid.plane
+        self.blocked = grid.obstacle_mask().reshape(-1)
+        layer_moves = grid.stack.moves(grid.width, grid.height, via_cost, wrong_direction_cost)
+
+        free = np.flatnonzero(~self.blocked)
+        self.costs = np.empty((0, grid.size))
+        if free.size == 0:
+            return
+        # Farthest-first: each landmark is the free cell farthest from the landmarks chosen so far
+        spread = self._costs_from(int(free[0]), grid, layer_moves)
+        for _ in range(count):
+            landmark = int(free[np.argmax(spread[free])])
+            costs = self._costs_from(landmark, grid, layer_moves)
+            self.costs = np.vstack([self.costs, costs])
+            spread = np.where(costs >= 0, np.minimum(spread, costs), spread) if len(self.costs) > 1 else costs
+
+    def _costs_from(self, source, grid, layer_moves):
+        """Dijkstra costs from a flat cell index to every cell, -1 where unreachable."""
+        width, height, plane = grid.width, grid.height, grid.plane
+        blocked = self.blocked
+        cost = [-1] * grid.size
+        cost[source] = 0
+        queue = [(0, source)]
+        while queue:
+            g, idx = heapq.heappop(queue)
+            if g > cost[idx] or (blocked[idx] and idx != source):
+                continue
+            layer, rem = divmod(idx, plane)
+            y, x = divmod(rem, width)
+            for dx, dy, step, move_cost in layer_moves[layer]:
+                if not (0 <= x + dx < width and 0 <= y + dy < height):
+                    continue
+                new_idx = idx + step
+                new_g = g + move_cost
+                if cost[new_idx] < 0 or new_g < cost[new_idx]:
+                    cost[new_idx] = new_g
+                    heapq.heappush(queue, (new_g, new_idx))
+        return np.array(cost, dtype=np.float64)
+
+    def bounds_for(self, targets):
+        """(costs view, lowest, highest target cost) per landmark that reaches some target.
+
+        The landmark tables never leave an obstacle, so for a target on one
+        only cost(L, t) - cost(L, v) holds and highest is infinite.
+        """
+        indices = [cell.layer * self.plane + cell.y * self.width + cell.x for cell in targets]
+        blocked_target = any(self.blocked[idx] for idx in indices)
+        bounds = []
+        for costs in self.costs:
+            reached = [costs[idx] for idx in indices if costs[idx] >= 0]
+            if reached:
+                bounds.append((memoryview(costs), min(reached), float('inf') if blocked_target else max(reached)))
+        return bounds
+
+
+SEARCH_WORKSPACE_KEEP_CELLS = 1 << 21  # Largest lanes a SearchWorkspace keeps once a smaller search follows
+
+
+class SearchWorkspace:
+    """Search state that is allocated once per grid and reused by every search on it.
+
+    Each lane is a (g_score, parent, stamp) triple of typed arrays (float64,
+    int64, uint32; 20 bytes per cell) indexed like a search window's local
+    buffers; bidirectional_search uses two lanes. Lanes grow to the
+    largest window searched, but lanes longer than
+    SEARCH_WORKSPACE_KEEP_CELLS are dropped by the next smaller search, so
+    one oversized search does not hold its memory for the rest of the run.
+    begin() starts a search in O(1) by moving to a new generation instead of
+    clearing the arrays: a cell is unvisited while its stamp is below the
+    generation's open stamp, and its g_score and parent are only meaningful
+    once it has been stamped.
+
+    masked holds the cells of the net being routed (its pins and its tree so
+    far), which route_net sets through mask() instead of marking them on the
+    grid. Searches close the masked cells inside their window before they
+    start, except their sources and targets.
+    """
+
+    def __init__(self):
+        self.lanes = []
+        self.generation = 0
+        self.masked = set()
+
+    def begin(self, size, lanes=1):
+        """Start a search over size local cells.
+
+        Returns:
+            (opened, closed, lanes): the stamps marking a cell as reached or
+            closed in this search, and the first lanes lanes, each at least
+            size long
+        """
+        if any(len(stamp) > max(size, SEARCH_WORKSPACE_KEEP_CELLS) for _, _, stamp in self.lanes):
+            self.lanes = []
+        while len(self.lanes) < lanes:
+            self.lanes.append((array('d'), array('q'), array('I')))
+        for lane in self.lanes[:lanes]:
+            for values in lane:
+                if len(values) < size:
+                    values.frombytes(bytes((size - len(values)) * values.itemsize))
+        self.generation += 2
+        if self.generation + 1 >= 1 << (8 * self.lanes[0][2].itemsize):
+            # The stamps would overflow: clear them and count generations afresh
+            for _, _, stamp in self.lanes:
+                stamp[:] = array('I', bytes(len(stamp) * stamp.itemsize))
+            self.generation = 2
+        return self.generation, self.generation + 1, self.lanes[:lanes]
+
+    def mask(self, cells):
+        self.masked.update(cells)
+
+    def clear_mask(self):
+        self.masked.clear()
+
+    def masked_local(self, window, local_width, plane):
+        """Local indices of the masked cells inside an inclusive window."""
+        min_x, min_y, max_x, max_y = window
+        return [layer * plane + (y - min_y) * local_width + (x - min_x)
+                for x, y, layer in self.masked if min_x <= x <= max_x and min_y <= y <= max_y]
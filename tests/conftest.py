@@ -0,0 +1,31 @@
+import ast
+import os
+import sys
+import types
+
+import pytest
+
+ROUTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _router_modules():
+    """benchmark.ROUTER_MODULES, read without running benchmark.py (it needs the router namespace)."""
+    with open(os.path.join(ROUTER_DIR, "benchmark.py")) as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, "id", None) == "ROUTER_MODULES"
+                                                for target in node.targets):
+            return ast.literal_eval(node.value)
+    raise LookupError("benchmark.py defines no ROUTER_MODULES")
+
+
+@pytest.fixture(scope="session")
+def router():
+    """The router modules and benchmark.py loaded into one namespace in load order, as the notebook cells run them."""
+    namespace = types.ModuleType("router")
+    sys.modules["router"] = namespace
+    for module in _router_modules() + ("benchmark.py",):
+        module_path = os.path.join(ROUTER_DIR, module)
+        with open(module_path) as f:
+            exec(compile(f.read(), module_path, "exec"), namespace.__dict__)
+    return namespace
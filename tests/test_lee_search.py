@@ -0,0 +1,15 @@
+import pytest
+
+
+@pytest.mark.parametrize("search", ["lee_search", "bidirectional_search", "array_lee_search"])
+def test_used_cells_accept_plain_tuples(router, search):
+    """used_cells may hold plain (x, y, layer) tuples as well as Cells, and the path avoids them."""
+    grid = router.RoutingGrid(8, 3, 1)
+    start, end = router.Cell(0, 1, 0), router.Cell(7, 1, 0)
+    used = {(x, 1, 0) for x in range(2, 6)}
+
+    path = getattr(router, search)(grid, start, end, grid.width, grid.height, 1, 2, used_cells=used)
+    assert path[0] == start and path[-1] == end
+    assert not used & {tuple(cell) for cell in path}
+    assert list(path) == list(getattr(router, search)(grid, start, end, grid.width, grid.height, 1, 2,
+                                                      used_cells={router.Cell(*cell) for cell in used}))
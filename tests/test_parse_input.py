@@ -0,0 +1,32 @@
+import pytest
+
+
+@pytest.mark.parametrize("line", ["OBS (1, 2) junk", "OBS (1, 2) x (3, 4)", "OBSTACLE (1, 2)", "OBS (1 2, 3)",
+                                  "OBS_RECT (1, 2, 3, 4) z", "net1 (1, 0, 0) (1, 3, 3) oops"])
+def test_stray_text_raises_line_numbered_error(router, tmp_path, line):
+    design = tmp_path / "design.txt"
+    design.write_text(f"10x10\nOBS (5, 5)\n{line}\nnet2 (1, 1, 1) (1, 2, 2)\n")
+    with pytest.raises(ValueError, match=r"line 3:"):
+        router.parse_input(str(design))
+
+
+def test_matches_baseline_parser(router, tmp_path):
+    """The bulk scanner reads a generated design like the regex parser it replaced."""
+    design = str(tmp_path / "design.txt")
+    router.generate_design(design, width=60, height=40, obstacle_density=0.1, net_count=50, layers=3, seed=1)
+    stack = router.LayerStack.alternating(3)
+    width, height, obstacles, nets, _, grid = router.parse_input(design, stack)
+    base_width, base_height, base_obstacles, base_nets, _, _ = router.baseline_parse_input(design)
+
+    assert (width, height) == (base_width, base_height)
+    assert [(rect.x0, rect.y0) for rect in obstacles] == base_obstacles
+    assert nets == base_nets
+    assert int((grid.cells == grid.OBSTACLE).sum()) == 3 * len(base_obstacles)
+
+
+def test_reachability_index_is_built_on_first_read(router, tmp_path):
+    design = tmp_path / "design.txt"
+    design.write_text("10x10\nOBS_RECT (5, 0, 5, 9)\nnet1 (1, 1, 1) (1, 8, 8)\n")
+    grid = router.parse_input(str(design))[-1]
+    assert grid._reachability is None
+    assert not grid.reachability.connected([router.Cell(1, 1, 0), router.Cell(8, 8, 0)])
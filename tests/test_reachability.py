@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+import pytest
+
+
+def _random_path(rng, grid, pins, length=40):
+    """A random walk of free cells on one layer, skipping the pins."""
+    x, y, layer = rng.randrange(grid.width), rng.randrange(grid.height), rng.randrange(grid.layers)
+    path = []
+    for _ in range(length):
+        if grid.flat[grid.index(x, y, layer)] == grid.EMPTY and (x, y, layer) not in path and (x, y, layer) not in pins:
+            path.append((x, y, layer))
+        step = rng.randrange(4)
+        x = min(max(x + (step == 0) - (step == 1), 0), grid.width - 1)
+        y = min(max(y + (step == 2) - (step == 3), 0), grid.height - 1)
+    return path
+
+
+def _same_partition(a, b):
+    """Whether two label arrays split the cells into the same components."""
+    if not np.array_equal(a < 0, b < 0):
+        return False
+    pairs = np.unique(np.stack([a[a >= 0], b[b >= 0]]), axis=1)
+    return pairs.shape[1] == np.unique(a[a >= 0]).size == np.unique(b[b >= 0]).size
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_index_matches_full_relabel(router, seed):
+    """Committing and clearing routes keeps the index equal to labelling the grid from scratch."""
+    rng = random.Random(seed)
+    grid = router.RoutingGrid(rng.randint(5, 30), rng.randint(5, 30), rng.randint(1, 3))
+    grid.mark_obstacles([(rng.randrange(grid.width), rng.randrange(grid.height))
+                         for _ in range(grid.plane // 6)])
+    pins = [router.Cell(rng.randrange(grid.width), rng.randrange(grid.height), rng.randrange(grid.layers))
+            for _ in range(6)]
+    pins = [pin for pin in pins if grid.get_state(pin) == grid.EMPTY]
+    index = grid.reachability = router.ReachabilityIndex(grid, pins)
+
+    paths = {}
+    for step in range(30):
+        if paths and rng.random() < 0.3:
+            net_name = rng.choice(sorted(paths))
+            grid.clear_net(net_name, path=paths.pop(net_name))
+        else:
+            net_name = f"net{step}"
+            paths[net_name] = [router.Cell(*cell) for cell in _random_path(rng, grid, pins)]
+            grid.assign_net(net_name, paths[net_name])
+
+        passable = (np.asarray(grid.cells).reshape(-1) == grid.EMPTY) | index.pin_mask
+        assert np.array_equal(index.passable, passable)
+        assert _same_partition(index.components(), router._label_components(passable.reshape(grid.shape)))
@@ -0,0 +1,21 @@
+import pytest
+
+
+@pytest.fixture
+def detour_design(tmp_path):
+    """A wall along x = 101 open only at y = 199, with a net's pins on either side of it."""
+    design = tmp_path / "detour.txt"
+    design.write_text("200x200\nOBS_RECT (101, 0, 101, 198)\nnet1 (1, 100, 100) (1, 102, 100)\n")
+    return str(design)
+
+
+def test_tiled_grid_routes_like_dense_grid(router, detour_design):
+    """A net that needs the whole grid still routes when the grid is tiled."""
+    routes = {}
+    for tile_size in (0, 16):
+        width, height, _, nets, pins_by_net, grid = router.parse_input(detour_design, tile_size=tile_size)
+        assert bool(grid.tile_size) == bool(tile_size)
+        routes[tile_size] = router.route_net("net1", nets, pins_by_net, grid, width, height)
+
+    assert len(routes[0]) == 203
+    assert list(routes[16]) == list(routes[0])
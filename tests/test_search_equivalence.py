@@ -0,0 +1,64 @@
+import random
+
+import numpy as np
+import pytest
+
+SEEDS = range(150)
+
+
+def _search_case(router, seed):
+    """A seeded random two-pin problem: (grid, start, end, search keyword arguments).
+
+    The arguments hold the costs and, at random, a congestion map, other
+    nets' cells and a window around the pins.
+    """
+    rng = random.Random(seed)
+    width, height, layers = rng.randint(3, 30), rng.randint(3, 30), rng.randint(1, 4)
+    via_costs = None if rng.random() < 0.5 else [rng.randint(1, 12) for _ in range(layers - 1)]
+    grid = router.RoutingGrid(width, height, layers, router.LayerStack.alternating(layers, via_costs))
+    cells = [router.Cell(x, y, layer) for layer in range(layers) for y in range(height) for x in range(width)]
+    start, end = rng.sample(cells, 2)
+    for _ in range(int(grid.plane * rng.random() * 0.3)):
+        cell = rng.choice(cells)
+        if cell not in (start, end):
+            grid.mark_obstacle(*cell)
+
+    kwargs = dict(via_cost=rng.randint(1, 12), wrong_direction_cost=rng.randint(1, 4))
+    if rng.random() < 0.5:
+        kwargs["congestion_map"] = np.random.RandomState(seed).randint(0, 3, grid.shape).astype(np.int16)
+    if rng.random() < 0.5:
+        kwargs["used_cells"] = set(rng.sample(cells, len(cells) // 10)) - {start, end}
+    if rng.random() < 0.3:
+        kwargs["window"] = (max(min(start.x, end.x) - 2, 0), max(min(start.y, end.y) - 2, 0),
+                            min(max(start.x, end.x) + 2, width - 1), min(max(start.y, end.y) + 2, height - 1))
+    return grid, start, end, kwargs
+
+
+def _path_cost(grid, path, via_cost, wrong_direction_cost, congestion_map=None, **_):
+    """Cost of a path as the searches price it: moves from LayerStack.moves plus twice each entered cell's congestion."""
+    layer_moves = grid.stack.moves(grid.width, grid.height, via_cost, wrong_direction_cost)
+    total = 0
+    for a, b in zip(path, path[1:]):
+        step = (b.x - a.x, b.y - a.y, grid.index(*b) - grid.index(*a))
+        total += next(move_cost for dx, dy, offset, move_cost in layer_moves[a.layer] if (dx, dy, offset) == step)
+        if congestion_map is not None:
+            total += 2 * int(congestion_map[b.layer, b.y, b.x])
+    return total
+
+
+@pytest.mark.parametrize("search, use_landmarks", [("lee_search", False), ("lee_search", True),
+                                                   ("bidirectional_search", False), ("bidirectional_search", True)])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_search_matches_wavefront(router, search, use_landmarks, seed):
+    """The A* searches find a path exactly when the heuristic-free array_lee_search does, at the same cost."""
+    grid, start, end, kwargs = _search_case(router, seed)
+    landmarks = (router.Landmarks(grid, kwargs["via_cost"], kwargs["wrong_direction_cost"], count=3)
+                 if use_landmarks else None)
+
+    expected = router.array_lee_search(grid, start, end, grid.width, grid.height, **kwargs)
+    path = getattr(router, search)(grid, start, end, grid.width, grid.height, landmarks=landmarks, **kwargs)
+
+    assert bool(path) == bool(expected)
+    if path:
+        assert (path[0], path[-1]) == (start, end)
+        assert _path_cost(grid, path, **kwargs) == _path_cost(grid, expected, **kwargs)
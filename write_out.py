@@ -11,47 +11,48 @@ def write_output(routed_nets, output_path):
             if path:  # Only write successfully routed nets
                 # Convert layer from 0-indexed back to 1-indexed for output
                 # Format: net_name (layer1, x1, y1) (layer2, x2, y2) ...
-                line = f"{net_name}"
-                
-                # Add each coordinate in the path
-                for cell in path:
-                    # Convert from 0-based to 1-based layer indexing
-                    line += f" ({cell.layer + 1}, {cell.x}, {cell.y})"
-                    
+                line = net_name + "".join(f" ({layer + 1}, {x}, {y})" for x, y, layer in path)
                 f.write(line + "\n")
     
-    print(f"Routing complete. Output saved to {output_path}")
+    logger.info("Routing complete. Output saved to %s", output_path)
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.collections import PatchCollection
 import itertools
-import re
+import math
 
-def visualize_routing(output_file, input_file):
-    width, height, obstacles, nets, pins_by_net, grid = parse_input(input_file)
+def visualize_routing(output_file, input_file, stack=LAYER_STACK):
+    width, height, obstacles, nets, pins_by_net, grid = parse_input(input_file, stack)
 
     width += 1
     height += 1
 
-    with open(output_file, 'r') as f:
-        lines = f.readlines()
-
-    fig, axs = plt.subplots(1, 2, figsize=(24, 12))
-    layer_names = ['Horizontal Layer (Layer 1)', 'Vertical Layer (Layer 2)']
+    # Text or binary results are both accepted
+    routed = read_routing_result(output_file)
+
+    # One plot per layer, two per row
+    layer_numbers = list(range(1, grid.layers + 1))
+    columns = min(grid.layers, 2)
+    rows = math.ceil(grid.layers / columns)
+    fig, axs = plt.subplots(rows, columns, figsize=(12 * columns, 12 * rows), squeeze=False)
+    axs = axs.reshape(-1)
+    for ax in axs[grid.layers:]:
+        ax.set_visible(False)
+    layer_names = [f"{'Horizontal' if direction == LayerStack.HORIZONTAL else 'Vertical'} Layer (Layer {layer})"
+                   for layer, direction in zip(layer_numbers, grid.stack.directions)]
     base_colors = ['blue', 'green', 'orange', 'purple', 'red', 'brown']
     colors = itertools.cycle(base_colors)
 
-    routes_by_layer = {1: {}, 2: {}}
-    pin_layer_presence = {1: set(), 2: set()}
+    routes_by_layer = {layer: {} for layer in layer_numbers}
+    pin_layer_presence = {layer: set() for layer in layer_numbers}
     full_routes_by_net = {}
 
     # Map each net to a color (keep this to show in legend)
     net_color_map = {}
 
-    for line in lines:
-        net_name = line.split()[0]
-        route_parts = re.findall(r'\((\d+),\s*(\d+),\s*(\d+)\)', line)
-        route_cells = [(int(z), int(x), int(y)) for (z, x, y) in route_parts if int(z) in [1, 2]]
+    for net_name, path in routed.items():
+        route_cells = [(layer + 1, x, y) for x, y, layer in path if layer + 1 in routes_by_layer]
 
         for z, x, y in route_cells:
             routes_by_layer.setdefault(z, {}).setdefault(net_name, []).append((x, y))
@@ -84,7 +85,7 @@ def visualize_routing(output_file, input_file):
             if (z1 != z2) and (x1 == x2) and (y1 == y2):
                 vias_all_layers.add((x1, y1))
 
-    for idx, layer in enumerate([1, 2]):
+    for idx, layer in enumerate(layer_numbers):
         ax = axs[idx]
         ax.set_title(layer_names[idx], fontsize=font_size + 4)
         ax.set_xlim(-0.5, width - 0.5)
@@ -100,10 +101,11 @@ def visualize_routing(output_file, input_file):
         if not routes_by_layer[layer]:
             continue
 
-        if obstacles:
-            obs_xs = [x + 0.5 for x, _ in obstacles]
-            obs_ys = [y + 0.5 for _, y in obstacles]
-            ax.scatter(obs_xs, obs_ys, marker='s', s=marker_size * 1.5, color='black', zorder=1)
+        # One patch per obstacle rectangle rather than one marker per blocked cell
+        obstacle_patches = [mpatches.Rectangle((rect.x0, rect.y0), rect.x1 - rect.x0 + 1, rect.y1 - rect.y0 + 1)
+                            for rect in obstacles if rect.layer is None or rect.layer == layer - 1]
+        if obstacle_patches:
+            ax.add_collection(PatchCollection(obstacle_patches, facecolor='black', edgecolor='none', zorder=1))
 
         for net_name, coords in routes_by_layer.get(layer, {}).items():
             color = net_color_map.get(net_name, 'black')
@@ -165,7 +167,17 @@ def visualize_routing(output_file, input_file):
 
 
 
-def main(input_file, output_file, generate_visualization=True):
+def main(input_file, output_file, generate_visualization=True, binary_output_file=None, profile_file=None,
+         stack=LAYER_STACK, previous_output=None):
+    """Parse, route and write one design on the given LayerStack.
+
+    With profile_file set, per-net profiling is enabled and written there as
+    CSV (.csv extension) or JSON, and the slowest nets are logged.
+
+    With previous_output set (a text or binary result of an earlier run),
+    the design is routed incrementally with route_all_nets_incremental:
+    previous routes that are still valid are kept and only the rest is routed.
+    """
     import os
     import time
     from datetime import datetime
@@ -178,17 +190,25 @@ def main(input_file, output_file, generate_visualization=True):
     print(f"\nMaze Router started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Reading input from: {input_file}")
     start_time = time.time()
+    configure_logging()
+    if profile_file:
+        PROFILER.enable()
 
     try:
         # Parse input file
-        width, height, obstacles, nets, pins_by_net, grid = parse_input(input_file)
-        print(f"\nGrid size: {width}x{height}")
+        width, height, obstacles, nets, pins_by_net, grid = parse_input(input_file, stack)
+        print(f"\nGrid size: {width}x{height}, {grid.layers} layers")
         print(f"Number of obstacles: {len(obstacles)}")
         print(f"Number of nets to route: {len(nets)}")
 
-        # Route all nets
-        print("\nRouting nets...")
-        routed_nets = route_all_nets(nets, pins_by_net, grid, width, height)
+        # Route all nets, or only what changed since the previous result
+        if previous_output:
+            print(f"\nRouting nets incrementally from {previous_output}...")
+            routed_nets = route_all_nets_incremental(nets, pins_by_net, grid, width, height,
+                                                     read_routing_result(previous_output))
+        else:
+            print("\nRouting nets...")
+            routed_nets = route_all_nets(nets, pins_by_net, grid, width, height)
 
         # Count successful routes
         successful_routes = len([net for net, path in routed_nets.items() if path])
@@ -198,11 +218,22 @@ def main(input_file, output_file, generate_visualization=True):
 
         # Write output file
         write_output(routed_nets, output_file)
+        if binary_output_file:
+            write_binary_output(routed_nets, binary_output_file)
+
+        if profile_file:
+            PROFILER.disable()
+            if profile_file.endswith(".csv"):
+                PROFILER.write_csv(profile_file)
+            else:
+                PROFILER.write_json(profile_file)
+            logger.info("\nSlowest nets:\n%s", PROFILER.summary())
+            print(f"Profile saved to {profile_file}")
 
         # Generate visualization (optional)
         if generate_visualization:
             print("\nGenerating visualizations...")
-            visualize_routing(output_file, input_file)
+            visualize_routing(output_file, input_file, stack)
 
         # Print timing summary
         elapsed_time = time.time() - start_time